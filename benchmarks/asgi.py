@@ -0,0 +1,102 @@
+import asyncio
+import json as jsonlib
+from typing import Dict, List, Tuple, Union
+from urllib.parse import urlencode
+
+
+class Response:
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return jsonlib.loads(self.body)
+
+
+# Minimal in-process ASGI client: no sockets, no HTTP parsing
+class ASGIClient:
+    def __init__(self, app):
+        self.app = app
+        self._lifespan_queue = None
+        self._lifespan_task = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Union[Dict, None] = None,
+        headers: Union[Dict[str, str], None] = None,
+        json=None,
+        content: bytes = b"",
+        chunk_size: int = 64 * 1024,
+    ) -> Response:
+        raw_headers = [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()]
+        if json is not None:
+            content = jsonlib.dumps(json).encode()
+            raw_headers.append((b"content-type", b"application/json"))
+        if content:
+            raw_headers.append((b"content-length", str(len(content)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": urlencode(params or {}, doseq=True).encode(),
+            "headers": [(b"host", b"testserver")] + raw_headers,
+            "server": ("testserver", 80),
+            "client": ("127.0.0.1", 50000),
+        }
+        chunks = [content[i: i + chunk_size] for i in range(0, len(content), chunk_size)] or [b""]
+        disconnect = asyncio.Event()
+        status, response_headers, body = 500, [], []
+
+        async def receive():
+            if chunks:
+                chunk = chunks.pop(0)
+                return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            disconnect.set()
+        return Response(status, response_headers, b"".join(body))
+
+    async def __aenter__(self):
+        self._lifespan_queue = asyncio.Queue()
+        startup = asyncio.get_running_loop().create_future()
+        self._lifespan_done = asyncio.get_running_loop().create_future()
+
+        async def receive():
+            return await self._lifespan_queue.get()
+
+        async def send(message):
+            if message["type"].startswith("lifespan.startup"):
+                startup.set_result(message)
+            elif message["type"].startswith("lifespan.shutdown"):
+                self._lifespan_done.set_result(message)
+
+        self._lifespan_task = asyncio.create_task(self.app({"type": "lifespan", "asgi": {"version": "3.0"}}, receive, send))
+        await self._lifespan_queue.put({"type": "lifespan.startup"})
+        await startup
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+        await self._lifespan_done
+        await self._lifespan_task
@@ -0,0 +1,111 @@
+import argparse
+import gc
+import json
+import random
+import timeit
+import tracemalloc
+
+from controllers import catalog as catalog_module
+from controllers.catalog import ColumnarCatalog
+
+DESCRIPTIONS = ["A very nice Item", "The bartenders", "The Pretenders", None]
+
+
+def rows(count: int, seed: int = 42):
+    # Fresh string objects per row, as parsed request bodies would have
+    rng = random.Random(seed)
+    for i in range(count):
+        description = rng.choice(DESCRIPTIONS)
+        yield {
+            "name": f"Item {i % 5000}",
+            "description": description.encode().decode() if description else None,
+            "price": round(rng.uniform(1, 1000), 2),
+            "tax": round(rng.uniform(0, 50), 2) if rng.random() < 0.7 else None,
+        }
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = build()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return store, retained
+
+
+def _filled(count: int) -> ColumnarCatalog:
+    columns = ColumnarCatalog()
+    batch = []
+    for row in rows(count):
+        batch.append(row)
+        if len(batch) == 10_000:
+            columns.extend(batch)
+            batch.clear()
+    columns.extend(batch)
+    return columns
+
+
+def bench(count: int, number: int):
+    dict_store, dict_bytes = measure(lambda: {key: row for key, row in enumerate(rows(count))})
+    columns, column_bytes = measure(lambda: _filled(count))
+    low, high = 100.0, 200.0
+
+    operations = {
+        "price_with_tax": (
+            lambda: [row["price"] + (row["tax"] or 0.0) for row in dict_store.values()],
+            lambda: columns.price_with_tax(),
+        ),
+        "totals": (
+            lambda: (sum(row["price"] for row in dict_store.values()),
+                     sum(row["tax"] or 0.0 for row in dict_store.values())),
+            lambda: columns.totals(),
+        ),
+        "price range filter": (
+            lambda: [key for key, row in dict_store.items() if low < row["price"] < high],
+            lambda: columns.ids(gt=low, lt=high),
+        ),
+    }
+    expected = [key for key, row in dict_store.items() if low < row["price"] < high]
+    assert list(columns.ids(gt=low, lt=high)) == expected
+
+    results = {
+        "items": count,
+        "backend": "numpy" if catalog_module.numpy is not None else "array",
+        "memory": {
+            "dict_bytes_per_item": dict_bytes / count,
+            "columnar_bytes_per_item": column_bytes / count,
+            "ratio": dict_bytes / column_bytes,
+        },
+        "operations": {},
+    }
+    for name, (baseline, columnar) in operations.items():
+        dict_ms = min(timeit.repeat(baseline, number=number, repeat=3)) / number * 1e3
+        columnar_ms = min(timeit.repeat(columnar, number=number, repeat=3)) / number * 1e3
+        results["operations"][name] = {"dict_ms": dict_ms, "columnar_ms": columnar_ms, "speedup": dict_ms / columnar_ms}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar catalog vs dict-per-item rows: memory and bulk operations")
+    parser.add_argument("--items", type=int, default=500_000)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = bench(args.items, args.number)
+    memory = results["memory"]
+    print(f"{results['items']} items, {results['backend']} backend")
+    print(f"{'bytes per item':<20} {memory['dict_bytes_per_item']:>10.1f} dict {memory['columnar_bytes_per_item']:>10.1f} "
+          f"columnar {memory['ratio']:>6.1f}x")
+    print(f"{'operation':<20} {'dict ms':>10} {'columnar ms':>12} {'speedup':>8}")
+    for name, stats in results["operations"].items():
+        print(f"{name:<20} {stats['dict_ms']:>10.2f} {stats['columnar_ms']:>12.2f} {stats['speedup']:>7.1f}x")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
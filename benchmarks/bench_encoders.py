@@ -0,0 +1,59 @@
+import argparse
+import json
+import timeit
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+
+from controllers.encoders import compile_encoder, encode_value
+from controllers.routers.body import Image, Item8, Offer
+from controllers.routers.updates import Item17, Item18
+from benchmarks.scenarios import offer
+
+
+def cases():
+    return {
+        "Item17": Item17(title="Foo", timestamp=datetime.now(), description="A very nice Item"),
+        "Item18": Item18(name="Foo", description="The bartenders", price=62, tax=20.2, tags=["a", "b"]),
+        "Item8 (25 images)": Item8(
+            name="Foo", price=35.4, tags={"rock", "metal"},
+            images=[Image(url=f"https://example.com/{i}.png", name=f"Image {i}") for i in range(25)],
+        ),
+        "Offer (20 items x 5 images)": Offer(**offer()),
+        "422 errors payload": {"detail": [{"loc": ("body", "size"), "msg": "value is not a valid integer",
+                                           "type": "type_error.integer"}] * 5, "body": {"id": uuid4(), "size": "XL"}},
+    }
+
+
+def bench(number: int):
+    results = {}
+    for name, value in cases().items():
+        if isinstance(value, dict):
+            compiled = encode_value
+        else:
+            compiled = compile_encoder(type(value))
+        assert compiled(value) == jsonable_encoder(value), name
+        baseline = min(timeit.repeat(lambda: jsonable_encoder(value), number=number, repeat=5)) / number
+        fast = min(timeit.repeat(lambda: compiled(value), number=number, repeat=5)) / number
+        results[name] = {"jsonable_encoder_us": baseline * 1e6, "compiled_us": fast * 1e6, "speedup": baseline / fast}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiled model encoders vs jsonable_encoder")
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = bench(args.number)
+    print(f"{'case':<30} {'jsonable_encoder us':>20} {'compiled us':>12} {'speedup':>8}")
+    for name, stats in results.items():
+        print(f"{name:<30} {stats['jsonable_encoder_us']:>20.2f} {stats['compiled_us']:>12.2f} {stats['speedup']:>7.1f}x")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
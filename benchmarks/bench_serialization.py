@@ -0,0 +1,74 @@
+import argparse
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.scenarios import offer
+from controllers.encoders import encode_model
+from controllers.routers.body import Offer
+from controllers.serialization import make_response_class
+
+
+def payloads():
+    return {
+        "Offer 20 items x 5 images": Offer(**offer(items=20)),
+        "Offer 200 items x 20 images": Offer(
+            name="Export", price=1.0, items=[dict(item, images=item["images"] * 4) for item in offer(items=200)["items"]]
+        ),
+    }
+
+
+def normalized(value):
+    # Set fields (tags) come out in whatever order each copy of the set iterates
+    if isinstance(value, dict):
+        return {key: normalized(val) for key, val in value.items()}
+    if isinstance(value, list):
+        items = [normalized(val) for val in value]
+        return sorted(items) if all(isinstance(item, str) for item in items) else items
+    return value
+
+
+def bench(number: int):
+    results = {}
+    for name, model in payloads().items():
+        baseline = JSONResponse(jsonable_encoder(model)).body
+        candidates = {
+            # What FastAPI does by default: encoder pass + stdlib json
+            "jsonable_encoder + stdlib": lambda: JSONResponse(jsonable_encoder(model)).body,
+            "compiled encoder + stdlib": lambda: JSONResponse(encode_model(model)).body,
+        }
+        for backend in ("stdlib", "orjson"):
+            response_class = make_response_class(backend)
+            if response_class.json_backend != backend:
+                continue
+            # The backend handles models/datetimes itself: no encoder pass at all
+            candidates[f"{backend} backend, no encoder pass"] = lambda cls=response_class: cls(model).body
+        results[name] = {}
+        for label, render in candidates.items():
+            assert normalized(json.loads(render())) == normalized(json.loads(baseline)), label
+            seconds = min(timeit.repeat(render, number=number, repeat=5)) / number
+            results[name][label] = seconds * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response serialization backends on large nested payloads")
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = bench(args.number)
+    for name, timings in results.items():
+        print(name)
+        baseline = timings["jsonable_encoder + stdlib"]
+        for label, micros in timings.items():
+            print(f"  {label:<36} {micros:>12.1f} us  {baseline / micros:>6.1f}x")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import json
+import timeit
+from typing import Literal, Union
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.utils import create_response_field
+from pydantic import create_model
+
+from controllers.projection import compile_response_projector
+from controllers.routers.response_models import BaseItem
+from controllers.unions import TaggedUnion
+
+
+def variants(count: int) -> TaggedUnion:
+    registry = TaggedUnion(BaseItem, tag="type")
+    for i in range(count):
+        registry.register(create_model(
+            f"Variant{i}", __base__=BaseItem, type=(Literal[f"variant{i}"], f"variant{i}"), **{f"extra{i}": (int, 0)}
+        ))
+    return registry
+
+
+def bench(number: int, count: int):
+    registry = variants(count)
+    members = tuple(registry.types.values())
+    plain = create_response_field("plain", Union[members])
+    project = compile_response_projector(registry.annotation())
+
+    results = {}
+    # First, middle and last member: a plain Union tries members in order
+    for position in (0, count // 2, count - 1):
+        tag = f"variant{position}"
+        row = {"description": "A tagged item", "type": tag, f"extra{position}": position}
+        expected = members[position].parse_obj(row)
+        value, errors = plain.validate(row, {}, loc=("response",))
+        assert errors is None and type(value) is type(expected)
+        assert project(row) == jsonable_encoder(expected)
+
+        timings = {
+            "union_validate": lambda: plain.validate(row, {}, loc=("response",)),
+            "union_response": lambda: jsonable_encoder(plain.validate(row, {}, loc=("response",))[0]),
+            "tagged_projector": lambda: project(row),
+        }
+        results[tag] = {
+            f"{name}_us": min(timeit.repeat(call, number=number, repeat=5)) / number * 1e6
+            for name, call in timings.items()
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tagged-union dispatch vs trying each Union member")
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--variants", type=int, default=24)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = bench(args.number, args.variants)
+    columns = list(next(iter(results.values())))
+    print(f"{'member':<12}" + "".join(f"{column:>26}" for column in columns))
+    for name, stats in results.items():
+        print(f"{name:<12}" + "".join(f"{stats[column]:>26.2f}" for column in columns))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
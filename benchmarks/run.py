@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from statistics import quantiles
+from typing import Dict, List
+
+from benchmarks.asgi import ASGIClient
+from benchmarks.scenarios import SCENARIOS, Scenario
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def percentiles(samples: List[float]):
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return value, value, value
+    cuts = quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+async def run_scenarios(scenarios: List[Scenario], requests: int, concurrency: int, warmup: int):
+    clients: Dict[str, ASGIClient] = {}
+    for scenario in scenarios:
+        if scenario.app not in clients:
+            clients[scenario.app] = ASGIClient(scenario.load_app())
+    for client in clients.values():
+        await client.__aenter__()
+
+    mix = [scenario for scenario in scenarios for _ in range(scenario.weight)]
+    latencies: Dict[str, List[float]] = {scenario.name: [] for scenario in scenarios}
+    errors: Dict[str, int] = {scenario.name: 0 for scenario in scenarios}
+
+    async def send(scenario: Scenario):
+        content = scenario.content() if callable(scenario.content) else scenario.content
+        return await clients[scenario.app].request(
+            scenario.method, scenario.path, params=scenario.params, headers=scenario.headers,
+            json=scenario.json, content=content,
+        )
+
+    for scenario in scenarios:
+        for _ in range(warmup):
+            await send(scenario)
+
+    remaining = requests
+
+    async def worker(rng: random.Random):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            scenario = rng.choice(mix)
+            start = time.perf_counter()
+            response = await send(scenario)
+            latencies[scenario.name].append(time.perf_counter() - start)
+            if response.status != scenario.expect:
+                errors[scenario.name] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(random.Random(seed)) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    for client in clients.values():
+        await client.__aexit__(None, None, None)
+
+    routes = {}
+    for scenario in scenarios:
+        samples = latencies[scenario.name]
+        p50, p95, p99 = percentiles(samples)
+        routes[scenario.name] = {
+            "requests": len(samples),
+            "errors": errors[scenario.name],
+            "rps": len(samples) / elapsed if elapsed else 0.0,
+            "p50_ms": p50 * 1000,
+            "p95_ms": p95 * 1000,
+            "p99_ms": p99 * 1000,
+        }
+    return {"elapsed_s": elapsed, "total_rps": requests / elapsed if elapsed else 0.0, "routes": routes}
+
+
+def print_report(result: dict, baseline: dict = None):
+    header = f"{'route':<40} {'reqs':>6} {'err':>4} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    if baseline:
+        header += f" {'Δp50':>8}"
+    print(header)
+    for name, stats in result["routes"].items():
+        line = (
+            f"{name:<40} {stats['requests']:>6} {stats['errors']:>4} {stats['rps']:>9.1f} "
+            f"{stats['p50_ms']:>8.3f} {stats['p95_ms']:>8.3f} {stats['p99_ms']:>8.3f}"
+        )
+        before = baseline["routes"].get(name) if baseline else None
+        if before and before["p50_ms"]:
+            line += f" {(stats['p50_ms'] / before['p50_ms'] - 1) * 100:>+7.1f}%"
+        print(line)
+    print(f"total: {result['total_rps']:.1f} req/s in {result['elapsed_s']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process ASGI benchmarks for the controller apps")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--filter", default="", help="Only run scenarios whose name contains this text")
+    parser.add_argument("--output", help="Where to write the JSON results (default: benchmarks/results/<rev>.json)")
+    parser.add_argument("--compare", help="Previous JSON results to compare against")
+    args = parser.parse_args()
+
+    scenarios = [scenario for scenario in SCENARIOS if args.filter in scenario.name]
+    result = asyncio.run(run_scenarios(scenarios, args.requests, args.concurrency, args.warmup))
+    result.update({
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "timestamp": time.time(),
+    })
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
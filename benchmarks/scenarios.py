@@ -0,0 +1,81 @@
+import importlib
+from typing import Callable, Dict, List, Union
+
+
+class Scenario:
+    def __init__(
+        self,
+        name: str,
+        app: str,
+        method: str,
+        path: str,
+        *,
+        weight: int = 1,
+        expect: int = 200,
+        params: Union[Dict, None] = None,
+        headers: Union[Dict[str, str], None] = None,
+        json=None,
+        content: Union[bytes, Callable[[], bytes]] = b"",
+    ):
+        self.name = name
+        self.app = app
+        self.method = method
+        self.path = path
+        self.weight = weight
+        self.expect = expect
+        self.params = params
+        self.headers = headers
+        self.json = json
+        self.content = content
+
+    def load_app(self):
+        module_name, _, attr = self.app.partition(":")
+        return getattr(importlib.import_module(module_name), attr or "app")
+
+
+def image(i: int):
+    return {"url": f"https://example.com/images/{i}.png", "name": f"Image {i}"}
+
+
+def item8(i: int, images: int = 10):
+    return {
+        "name": f"Item {i}",
+        "description": "A very nice Item",
+        "price": 35.4 + i,
+        "tax": 3.2,
+        "tags": ["rock", "metal", "bar"],
+        "images": [image(j) for j in range(images)],
+    }
+
+
+def offer(items: int = 20):
+    return {"name": "Offer", "description": "Big bundle", "price": 999.0, "items": [item8(i, images=5) for i in range(items)]}
+
+
+AUTH = {"authorization": "Bearer johndoe"}
+TOKENS = {"x-token": "fake-super-secret-token", "x-key": "fake-super-secret-key"}
+
+SCENARIOS: List[Scenario] = [
+    # main.py: body-heavy requests
+    Scenario("main PUT /items29/{item_id}", "controllers.main", "PUT", "/items29/1", weight=4, json=item8(1, images=25)),
+    Scenario("main POST /offers/", "controllers.main", "POST", "/offers/", weight=2, json=offer()),
+    Scenario("main GET /items40/{item_id}", "controllers.main", "GET", "/items40/bar", weight=4),
+    Scenario("main GET /items45/{item_id}", "controllers.main", "GET", "/items45/item1", weight=2),
+    Scenario("main GET /items/", "controllers.main", "GET", "/items/", weight=2, params={"limit": 2}),
+    # main2.py: dependency-heavy requests
+    Scenario("main2 GET /items3/", "controllers.main2", "GET", "/items3/", weight=2, headers={"cookie": "last_query=foo"}),
+    Scenario("main2 GET /items4/", "controllers.main2", "GET", "/items4/", weight=1, headers=TOKENS),
+    Scenario("main3 GET /users/", "controllers.main3", "GET", "/users/", weight=1, headers=TOKENS),
+    # main4.py: auth-protected requests
+    Scenario("main4 GET /users/me2", "controllers.main4", "GET", "/users/me2", weight=4, headers=AUTH),
+    Scenario(
+        "main4 POST /token", "controllers.main4", "POST", "/token", weight=1,
+        headers={"content-type": "application/x-www-form-urlencoded"}, content=b"username=johndoe&password=secret",
+    ),
+    # exception.py: error paths
+    Scenario("exception GET /items52/3", "controllers.exception", "GET", "/items52/3", weight=2, expect=418),
+    Scenario("exception GET /items52/{bad}", "controllers.exception", "GET", "/items52/abc", weight=2, expect=422),
+    Scenario("exception POST /items51/ invalid", "controllers.exception", "POST", "/items51/", weight=1, expect=422,
+             json={"title": "towel", "size": "XL"}),
+    Scenario("exception GET /unicorns/yolo", "controllers.exception", "GET", "/unicorns/yolo", weight=1, expect=418),
+]
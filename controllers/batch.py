@@ -0,0 +1,76 @@
+from functools import lru_cache
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.datastructures import DefaultPlaceholder
+from pydantic import create_model
+
+from controllers.conditional import NotModified, etag_matches
+from controllers.fields import fields_etag, parse_fields
+from controllers.settings import settings
+from controllers.store import VersionedStore
+
+
+def batch_ids(
+    ids: List[str] = Query(description="Keys to fetch, comma separated and/or repeated: ?ids=foo,bar&ids=baz"),
+) -> List[str]:
+    # Duplicates are dropped, the first occurrence keeps its position
+    keys = list(dict.fromkeys(key for value in ids for key in value.split(",") if key))
+    if len(keys) > settings.batch_max_ids:
+        raise HTTPException(status_code=400, detail=f"At most {settings.batch_max_ids} ids per request")
+    return keys
+
+
+@lru_cache(maxsize=None)
+def batch_model(model):
+    # Documents the batch envelope in OpenAPI; responses are not validated against it
+    return create_model(
+        f"{model.__name__}Batch",
+        items=(Dict[str, model], ...),
+        not_found=(List[str], []),
+    )
+
+
+def _find_route(router: APIRouter, path: str):
+    for route in router.routes:
+        if getattr(route, "path", None) == path and "GET" in route.methods:
+            return route
+    raise ValueError(f"No GET route {path}")
+
+
+# Adds GET <path>?ids=a,b,c next to an existing single-item trusted route: all
+# keys are read in one store call and filtered through that route's projector,
+# so the response_model_* options (and ?fields=) match the single reads.
+# Missing keys are listed under not_found instead of failing the batch.
+def add_batch_route(router: APIRouter, path: str, store: VersionedStore, item_path: str, item_router: APIRouter = None):
+    item_route = _find_route(item_router or router, item_path)
+    sparse_fields = getattr(item_route, "sparse_fields", None)
+    if sparse_fields is None:
+        raise ValueError(f"{item_path} is not a trusted route with a compiled projector")
+    # Set when VALIDATE_TRUSTED_RESPONSES is on: rows are validated like single reads
+    check = item_route.check
+    response_class = item_route.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+
+    async def read_batch(request: Request, ids: List[str] = Depends(batch_ids), projector=Depends(sparse_fields)):
+        found, missing = store.get_many(ids)
+        etag = fields_etag(store.etag_many(found, missing), parse_fields(request.query_params.get("fields")))
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise NotModified(etag)
+        content = {
+            "items": {key: projector(row if check is None else check(row)) for key, (_, row) in found.items()},
+            "not_found": missing,
+        }
+        return response_class(content, headers={"ETag": etag})
+
+    router.add_api_route(
+        path,
+        read_batch,
+        methods=["GET"],
+        response_model=batch_model(item_route.response_model),
+        response_class=response_class,
+        name=f"{item_route.name}_batch",
+        tags=item_route.tags,
+    )
@@ -0,0 +1,211 @@
+import math
+import operator
+import sys
+from array import array
+from itertools import compress
+from typing import Iterable, List, Tuple, Union
+
+try:
+    import numpy
+except ImportError:  # listed in requirements.txt; without it the array module fallback gives the same results
+    numpy = None
+
+
+def _interned(value: Union[str, None]) -> Union[str, None]:
+    return sys.intern(value) if value is not None else None
+
+
+def price_bounds(gt: float = None, ge: float = None, lt: float = None, le: float = None) -> Tuple[float, float]:
+    # Strict bounds become inclusive ones on the neighbouring float
+    lower, upper = -math.inf, math.inf
+    if gt is not None:
+        lower = math.nextafter(gt, math.inf)
+    if ge is not None:
+        lower = max(lower, ge)
+    if lt is not None:
+        upper = math.nextafter(lt, -math.inf)
+    if le is not None:
+        upper = min(upper, le)
+    return lower, upper
+
+
+def _to_array(values, typecode: str) -> array:
+    # Copies a numpy result out so no view keeps the column buffers exported
+    # (an exported array("d") can't grow)
+    result = array(typecode)
+    result.frombytes(values.astype(numpy.float64 if typecode == "d" else numpy.int64).tobytes())
+    return result
+
+
+# Column-oriented store for Item2-shaped rows (name, description, price, tax).
+# Strings are interned and kept in lists, numbers in array("d") columns, so
+# an item costs a few machine words instead of a dict of boxed floats.
+# Row ids are dense ints handed out by append(); deleted rows clear their
+# `alive` flag and get a NaN price, which no price filter matches. Bulk
+# computations run over whole columns (vectorized with numpy, a listed
+# dependency; the array module fallback gives the same results, slower) and
+# dicts are built only for the rows being returned.
+class ColumnarCatalog:
+    key_type = int
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.descriptions: List[Union[str, None]] = []
+        self.price = array("d")
+        self.tax = array("d")  # 0.0 where the item has no tax
+        self.has_tax = bytearray()
+        self.alive = bytearray()
+        self._live = 0
+
+    def __len__(self):
+        return self._live
+
+    def __contains__(self, key):
+        return isinstance(key, int) and 0 <= key < len(self.alive) and self.alive[key] == 1
+
+    def append(self, row: dict) -> int:
+        return self.extend([row])[0]
+
+    def extend(self, rows: Iterable[dict]) -> range:
+        rows = list(rows)
+        start = len(self.alive)
+        taxes = [row.get("tax") for row in rows]
+        self.names.extend(sys.intern(row["name"]) for row in rows)
+        self.descriptions.extend(_interned(row.get("description")) for row in rows)
+        self.price.extend(float(row["price"]) for row in rows)
+        self.tax.extend(float(tax) if tax is not None else 0.0 for tax in taxes)
+        self.has_tax.extend(tax is not None for tax in taxes)
+        self.alive.extend(b"\x01" * len(rows))
+        self._live += len(rows)
+        return range(start, start + len(rows))
+
+    def delete(self, key) -> bool:
+        if key not in self:
+            return False
+        self.alive[key] = 0
+        self.price[key] = math.nan
+        self.names[key] = self.descriptions[key] = None
+        self._live -= 1
+        return True
+
+    # Response edge: the only place rows become dicts
+    def row(self, key: int) -> dict:
+        price = self.price[key]
+        tax = self.tax[key] if self.has_tax[key] else None
+        row = {"id": key, "name": self.names[key], "description": self.descriptions[key], "price": price, "tax": tax}
+        if tax:
+            row["price_with_tax"] = price + tax
+        return row
+
+    def get(self, key, default=None):
+        return self.row(key) if key in self else default
+
+    def seek(self, after: Union[int, None], limit: int) -> List[Tuple[int, dict]]:
+        # Same contract as OrderedItemStore.seek, so Pagination works on it
+        rows = []
+        key = -1 if after is None else max(after, -1)
+        while len(rows) < limit:
+            key = self.alive.find(1, key + 1)
+            if key < 0:
+                break
+            rows.append((key, self.row(key)))
+        return rows
+
+    # Vectorized bulk operations
+    def ids(self, gt: float = None, ge: float = None, lt: float = None, le: float = None) -> array:
+        # Live row ids whose price is within the given bounds, ascending
+        lower, upper = price_bounds(gt, ge, lt, le)
+        if numpy is not None and self.alive:
+            price = numpy.frombuffer(self.price, dtype=numpy.float64)
+            return _to_array(numpy.flatnonzero((price >= lower) & (price <= upper)), "q")
+        return array("q", [key for key, price in enumerate(self.price) if lower <= price <= upper])
+
+    def where(self, gt: float = None, ge: float = None, lt: float = None, le: float = None) -> "CatalogSelection":
+        return CatalogSelection(self, *price_bounds(gt, ge, lt, le))
+
+    def seek_where(self, after: Union[int, None], limit: int, lower: float, upper: float) -> List[Tuple[int, dict]]:
+        # Scans forward from the cursor until `limit` rows match, so a filtered
+        # page costs the rows it skips, not a pass over the whole column.
+        # Deleted rows have a NaN price and fail the test on their own.
+        start = 0 if after is None else max(after + 1, 0)
+        keys = []
+        if numpy is not None and self.alive:
+            price = numpy.frombuffer(self.price, dtype=numpy.float64)
+            window = max(4 * limit, 1024)
+            while start < len(price) and len(keys) < limit:
+                chunk = price[start:start + window]
+                hits = numpy.flatnonzero((chunk >= lower) & (chunk <= upper))[:limit - len(keys)]
+                keys.extend((hits + start).tolist())
+                start += window
+                window *= 2
+        else:
+            price = self.price
+            for key in range(start, len(price)):
+                if lower <= price[key] <= upper:
+                    keys.append(key)
+                    if len(keys) == limit:
+                        break
+        return [(key, self.row(key)) for key in keys]
+
+    def price_with_tax(self, ids: Union[array, None] = None) -> array:
+        # price + tax for the given row ids, or for every slot (deleted ones included)
+        if numpy is not None and self.alive:
+            price = numpy.frombuffer(self.price, dtype=numpy.float64)
+            tax = numpy.frombuffer(self.tax, dtype=numpy.float64)
+            if ids is not None:
+                index = numpy.frombuffer(ids, dtype=numpy.int64) if ids else numpy.empty(0, numpy.int64)
+                price, tax = price[index], tax[index]
+            return _to_array(price + tax, "d")
+        if ids is None:
+            return array("d", map(operator.add, self.price, self.tax))
+        price, tax = self.price, self.tax
+        return array("d", [price[key] + tax[key] for key in ids])
+
+    def totals(self, ids: Union[array, None] = None) -> dict:
+        # Sums over the given row ids, or over every live row
+        if numpy is not None and self.alive:
+            if ids is None:
+                ids = self.ids()
+            index = numpy.frombuffer(ids, dtype=numpy.int64) if ids else numpy.empty(0, numpy.int64)
+            count = len(ids)
+            price = float(numpy.frombuffer(self.price, dtype=numpy.float64)[index].sum())
+            tax = float(numpy.frombuffer(self.tax, dtype=numpy.float64)[index].sum())
+        elif ids is None:
+            count = self._live
+            price = sum(compress(self.price, self.alive), 0.0)
+            tax = sum(compress(self.tax, self.alive), 0.0)
+        else:
+            count = len(ids)
+            price = sum((self.price[key] for key in ids), 0.0)
+            tax = sum((self.tax[key] for key in ids), 0.0)
+        return {"count": count, "price": price, "tax": tax, "price_with_tax": price + tax}
+
+
+# Rows of a catalog within inclusive price bounds. Pages seek from the cursor;
+# the full id list is only built for bulk operations (totals, price_with_tax)
+class CatalogSelection:
+    key_type = int
+
+    def __init__(self, catalog: ColumnarCatalog, lower: float, upper: float):
+        self.catalog = catalog
+        self.lower = lower
+        self.upper = upper
+        self._ids: Union[array, None] = None
+
+    @property
+    def ids(self) -> array:
+        if self._ids is None:
+            self._ids = self.catalog.ids(ge=self.lower, le=self.upper)
+        return self._ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def seek(self, after: Union[int, None], limit: int) -> List[Tuple[int, dict]]:
+        return self.catalog.seek_where(after, limit, self.lower, self.upper)
+
+    def price_with_tax(self) -> array:
+        return self.catalog.price_with_tax(self.ids)
+
+    def totals(self) -> dict:
+        return self.catalog.totals(self.ids)
@@ -0,0 +1,34 @@
+from fastapi import HTTPException, Request, Response
+
+from controllers.fields import fields_etag, parse_fields
+from controllers.store import VersionedStore
+
+
+class NotModified(HTTPException):
+    def __init__(self, etag: str):
+        super().__init__(status_code=304, headers={"ETag": etag})
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+# Conditional GET dependency: answers 304 before the endpoint runs when the
+# client already holds the current version, otherwise sets the ETag header.
+class ETagged:
+    def __init__(self, store: VersionedStore, key_param: str = "item_id"):
+        self.store = store
+        self.key_param = key_param
+
+    async def __call__(self, request: Request, response: Response):
+        key = request.path_params[self.key_param]
+        if key not in self.store:
+            return
+        etag = fields_etag(self.store.etag(key), parse_fields(request.query_params.get("fields")))
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise NotModified(etag)
+        response.headers["ETag"] = etag
@@ -0,0 +1,164 @@
+import dataclasses
+from collections import deque
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Callable, Dict, Type
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from pydantic.fields import (
+    SHAPE_DICT,
+    SHAPE_FROZENSET,
+    SHAPE_LIST,
+    SHAPE_MAPPING,
+    SHAPE_SEQUENCE,
+    SHAPE_SET,
+    SHAPE_SINGLETON,
+    SHAPE_TUPLE_ELLIPSIS,
+    ModelField,
+)
+
+_PRIMITIVES = (str, int, float, bool)
+_SEQUENCE_SHAPES = (SHAPE_LIST, SHAPE_SET, SHAPE_FROZENSET, SHAPE_SEQUENCE, SHAPE_TUPLE_ELLIPSIS)
+_MAPPING_SHAPES = (SHAPE_DICT, SHAPE_MAPPING)
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _seconds(value: timedelta):
+    return value.total_seconds()
+
+
+# Same conversions as pydantic's ENCODERS_BY_TYPE for the common types
+_SCALAR_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    datetime: _isoformat,
+    date: _isoformat,
+    time: _isoformat,
+    timedelta: _seconds,
+    UUID: str,
+    Decimal: float,
+    PurePath: str,
+}
+
+
+def encode_value(value: Any) -> Any:
+    # Generic fast path, for values whose type isn't known up front
+    if value is None or type(value) in _PRIMITIVES:
+        return value
+    if isinstance(value, BaseModel):
+        return encode_model(value)
+    if isinstance(value, dict):
+        return {encode_value(key): encode_value(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        return [encode_value(val) for val in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, _PRIMITIVES):
+        return value
+    encoder = _SCALAR_ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    if dataclasses.is_dataclass(value):
+        return encode_value(dataclasses.asdict(value))
+    return jsonable_encoder(value)
+
+
+def _encode_nested(value: BaseModel) -> dict:
+    # Inside a model, nested models are encoded by their runtime class (a
+    # subclass keeps its extra fields), and without their own json_encoders:
+    # jsonable_encoder goes through model.dict(), which drops them below the top
+    return compile_encoder(type(value))(value)
+
+
+def _encode_nested_value(value: Any) -> Any:
+    # encode_value for values of a model's field whose type is only known at runtime
+    if isinstance(value, BaseModel):
+        return _encode_nested(value)
+    if isinstance(value, dict):
+        return {encode_value(key): _encode_nested_value(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        return [_encode_nested_value(val) for val in value]
+    return encode_value(value)
+
+
+def _value_encoder(field: ModelField):
+    # Returns an encoder for one value of the field, or None when it's a JSON primitive
+    type_ = field.type_
+    if field.sub_fields and field.shape == SHAPE_SINGLETON:
+        # Union / Optional of several types: dispatch at runtime
+        if all(isinstance(sub.type_, type) and issubclass(sub.type_, _PRIMITIVES) for sub in field.sub_fields):
+            return None
+        return _encode_nested_value
+    if not isinstance(type_, type):
+        return _encode_nested_value
+    if issubclass(type_, BaseModel):
+        return _encode_nested
+    if issubclass(type_, Enum):
+        return _enum_value
+    if issubclass(type_, _PRIMITIVES):
+        return None
+    for base, encoder in _SCALAR_ENCODERS.items():
+        if issubclass(type_, base):
+            return encoder
+    return _encode_nested_value
+
+
+def _enum_value(value):
+    return value.value
+
+
+def _field_encoder(field: ModelField):
+    item_encoder = _value_encoder(field)
+    if field.shape == SHAPE_SINGLETON:
+        return item_encoder
+    if field.shape in _SEQUENCE_SHAPES:
+        if item_encoder is None:
+            return list
+        return lambda values: [item_encoder(value) for value in values]
+    if field.shape in _MAPPING_SHAPES:
+        if item_encoder is None:
+            return dict
+        return lambda values: {key: item_encoder(value) for key, value in values.items()}
+    return _encode_nested_value
+
+
+_compiled: Dict[Type[BaseModel], Callable[[BaseModel], dict]] = {}
+
+
+def compile_encoder(model: Type[BaseModel]) -> Callable[[BaseModel], dict]:
+    # Builds (once per model class) a function that turns an instance into
+    # JSON-compatible data, like jsonable_encoder(instance) does.
+    encoder = _compiled.get(model)
+    if encoder is not None:
+        return encoder
+
+    namespace: Dict[str, Any] = {}
+
+    items = []
+    for index, field in enumerate(model.__fields__.values()):
+        value = f"values[{field.name!r}]"
+        field_encoder = _field_encoder(field)
+        if field_encoder is not None:
+            namespace[f"encoder_{index}"] = field_encoder
+            if field.allow_none:
+                value = f"(None if {value} is None else encoder_{index}({value}))"
+            else:
+                value = f"encoder_{index}({value})"
+        items.append(f"{field.alias!r}: {value}")
+
+    source = "def encode(obj):\n    values = obj.__dict__\n    return {" + ", ".join(items) + "}\n"
+    exec(compile(source, f"<encoder {model.__name__}>", "exec"), namespace)
+    _compiled[model] = encoder = namespace["encode"]
+    return encoder
+
+
+def encode_model(obj: BaseModel) -> dict:
+    # A model's json_encoders apply to its whole tree; those go through jsonable_encoder
+    if obj.__config__.json_encoders:
+        return jsonable_encoder(obj)
+    return compile_encoder(type(obj))(obj)
@@ -2,7 +2,6 @@ from fastapi import FastAPI, status
 from fastapi import Request
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse, PlainTextResponse
-from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.exception_handlers import http_exception_handler, request_validation_exception_handler
 
@@ -10,8 +9,16 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from pydantic import BaseModel
 
+from controllers.encoders import encode_value
+from controllers.logs import logger
+from controllers.metrics import install_metrics
+from controllers.openapi_cache import install_openapi_cache
+from controllers.serialization import app_response_class
+
 # Handling Errors
-app = FastAPI()
+app = FastAPI(default_response_class=app_response_class("exception"))
+install_openapi_cache(app, name="exception")
+install_metrics(app, name="exception")
 
 items5 = {"foo": "The Foo Wrestlers"}
 
@@ -76,7 +83,7 @@ async def read_item(item_id: int):
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=jsonable_encoder({"detail": exc.errors(), "body": exc.body}),
+        content=encode_value({"detail": exc.errors(), "body": exc.body}),
     )
 
 
@@ -92,13 +99,26 @@ async def create_item(item: Item16):
 
 @app.exception_handler(StarletteHTTPException)
 async def custom_http_exception_handler(request, exc):
-    print(f"OMG! An HTTP error!: {repr(exc)}")
+    logger.warning(
+        "OMG! An HTTP error!",
+        sample_key=("http_error", request.url.path, exc.status_code),
+        path=request.url.path,
+        status_code=exc.status_code,
+        detail=exc.detail,
+    )
     return await http_exception_handler(request, exc)
 
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request, exc):
-    print(f"OMG! The client sent invalid data!: {exc}")
+    # Only the error locations and types are logged, never the request body
+    errors = [{"loc": error["loc"], "type": error["type"]} for error in exc.errors()]
+    logger.warning(
+        "OMG! The client sent invalid data!",
+        sample_key=("validation_error", request.url.path, repr(errors)),
+        path=request.url.path,
+        errors=errors,
+    )
     return await request_validation_exception_handler(request, exc)
 
 
@@ -0,0 +1,61 @@
+import hashlib
+from functools import lru_cache
+from typing import FrozenSet, Tuple, Union
+
+from fastapi import Query
+from fastapi.exceptions import RequestValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import PydanticValueError
+
+from controllers.projection import Projector, TaggedProjector
+
+FIELDS_DESCRIPTION = "Comma separated top-level fields to return, e.g. ?fields=name,price"
+
+
+class UnknownFieldsError(PydanticValueError):
+    code = "fields.unknown"
+    msg_template = "unknown fields: {fields}; available: {available}"
+
+
+def parse_fields(value: Union[str, None]) -> Tuple[str, ...]:
+    # Normalized (sorted, deduplicated) so equivalent requests share a projector
+    if not value:
+        return ()
+    return tuple(sorted({name.strip() for name in value.split(",") if name.strip()}))
+
+
+def fields_etag(etag: str, fields: Tuple[str, ...]) -> str:
+    # A sparse response is a different representation of the same version
+    if not fields:
+        return etag
+    return f'{etag[:-1]}-f{hashlib.sha256(",".join(fields).encode()).hexdigest()[:12]}"'
+
+
+# Query dependency added to trusted routes: resolves ?fields= to a projector
+# restricted to those fields. Unrequested fields (nested models included) are
+# never read, projected or encoded.
+class SparseFields:
+    def __init__(self, projector: Union[Projector, TaggedProjector], options: dict, many: bool = False, cache_size: int = 256):
+        self.projector = projector
+        self.options = options
+        self.many = many
+        # Output name (alias) -> field name, limited to what the route already exposes
+        self.available = {output_name: name for name, output_name, *_ in projector.fields}
+        self._compile = lru_cache(maxsize=cache_size)(self._build)
+
+    def _build(self, names: FrozenSet[str]):
+        # Built directly rather than through get_projector, so only this bounded cache holds them
+        projector = self.projector.with_options(**{**self.options, "include": names})
+        return projector.project_many if self.many else projector
+
+    def select(self, fields: Tuple[str, ...]):
+        if not fields:
+            return self.projector.project_many if self.many else self.projector
+        unknown = [name for name in fields if name not in self.available]
+        if unknown:
+            error = UnknownFieldsError(fields=", ".join(unknown), available=", ".join(self.available))
+            raise RequestValidationError([ErrorWrapper(error, loc=("query", "fields"))])
+        return self._compile(frozenset(self.available[name] for name in fields))
+
+    async def __call__(self, fields: Union[str, None] = Query(default=None, description=FIELDS_DESCRIPTION)):
+        return self.select(parse_fields(fields))
@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import importlib
+from typing import Dict, Tuple
+
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from controllers.metrics import registry
+
+# Prefix -> app import path. Each sub-app keeps its own middleware and
+# exception handlers, the gateway only dispatches.
+MOUNTS = {
+    "/main": "controllers.main:app",
+    "/main2": "controllers.main2:app",
+    "/main3": "controllers.main3:app",
+    "/main4": "controllers.main4:app",
+    "/exception": "controllers.exception:app",
+}
+
+
+def import_app(path: str):
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class _Node:
+    __slots__ = ("children", "app", "prefix")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.app = None
+        self.prefix = ""
+
+
+# Segment trie over mount prefixes: a lookup costs one dict hit per path segment
+class PrefixTrie:
+    def __init__(self):
+        self.root = _Node()
+
+    def insert(self, prefix: str, app):
+        node = self.root
+        for segment in prefix.strip("/").split("/"):
+            node = node.children.setdefault(segment, _Node())
+        node.app = app
+        node.prefix = "/" + prefix.strip("/")
+
+    def match(self, path: str) -> Tuple[object, str]:
+        node = self.root
+        found = (None, "")
+        for segment in path[1:].split("/"):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.app is not None:
+                found = (node.app, node.prefix)
+        return found
+
+
+class Gateway:
+    def __init__(self, mounts: Dict[str, object]):
+        self.apps = dict(mounts)
+        self.trie = PrefixTrie()
+        for prefix, app in self.apps.items():
+            self.trie.insert(prefix, app)
+            # Lets the pre-fork master build the schema each app serves under its prefix
+            cache = getattr(getattr(app, "state", None), "openapi_cache", None)
+            if cache is not None:
+                cache.mount(prefix)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+
+        path = scope["path"]
+        if path == "/metrics":
+            response = PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+            return await response(scope, receive, send)
+        app, prefix = self.trie.match(path)
+        if app is None:
+            response = JSONResponse({"detail": "Not Found"}, status_code=404)
+            return await response(scope, receive, send)
+        child_scope = dict(scope)
+        child_scope["root_path"] = scope.get("root_path", "") + prefix
+        child_scope["path"] = path[len(prefix):] or "/"
+        await app(child_scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        # Fan the lifespan events out to every sub-app
+        lifespans = [_SubAppLifespan(app) for app in self.apps.values()]
+        message = await receive()
+        assert message["type"] == "lifespan.startup"
+        try:
+            for lifespan in lifespans:
+                await lifespan.startup()
+        except Exception as exc:
+            await send({"type": "lifespan.startup.failed", "message": repr(exc)})
+            return
+        await send({"type": "lifespan.startup.complete"})
+        message = await receive()
+        assert message["type"] == "lifespan.shutdown"
+        for lifespan in reversed(lifespans):
+            await lifespan.shutdown()
+        await send({"type": "lifespan.shutdown.complete"})
+
+
+class _SubAppLifespan:
+    def __init__(self, app):
+        self.app = app
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.task = None
+
+    async def _send(self, message):
+        await self.events.put(message)
+
+    async def startup(self):
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}}
+        self.task = asyncio.create_task(self.app(scope, self.queue.get, self._send))
+        await self.queue.put({"type": "lifespan.startup"})
+        message = await self.events.get()
+        if message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(message.get("message", "startup failed"))
+
+    async def shutdown(self):
+        await self.queue.put({"type": "lifespan.shutdown"})
+        await self.events.get()
+        await self.task
+
+
+def create_gateway(mounts: Dict[str, str] = MOUNTS) -> Gateway:
+    return Gateway({prefix: import_app(path) for prefix, path in mounts.items()})
+
+
+app = create_gateway()
+
+
+def main():
+    from controllers.serve import serve
+
+    parser = argparse.ArgumentParser(description="Serve every controller app from one process fleet")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    serve(app, host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from controllers.settings import settings
+
+DROP_NEW = "drop_new"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+
+# Non-blocking structured logger: the event loop only enqueues, a background
+# thread serializes and writes the JSON lines.
+class AsyncJsonLogger:
+    def __init__(
+        self,
+        stream=None,
+        maxsize: int = settings.log_queue_size,
+        drop_policy: str = settings.log_drop_policy,
+        sample_window: float = settings.log_sample_window,
+        sample_burst: int = settings.log_sample_burst,
+    ):
+        if drop_policy not in (DROP_NEW, DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.stream = stream
+        self.drop_policy = drop_policy
+        self.sample_window = sample_window
+        self.sample_burst = sample_burst
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._samples = {}
+        self._thread = None
+        self._start_lock = threading.Lock()
+        # Threads don't survive fork(): a pre-fork worker starts its own writer
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def log(self, level: str, event: str, sample_key=None, **fields):
+        suppressed = 0
+        if sample_key is not None:
+            now = time.monotonic()
+            if len(self._samples) > 10_000 and sample_key not in self._samples:
+                self._samples.clear()
+            window_start, count, suppressed_so_far = self._samples.get(sample_key, (now, 0, 0))
+            if now - window_start >= self.sample_window:
+                # New window: report how many identical records were swallowed
+                suppressed = suppressed_so_far
+                window_start, count, suppressed_so_far = now, 0, 0
+            if count >= self.sample_burst:
+                self._samples[sample_key] = (window_start, count, suppressed_so_far + 1)
+                return
+            self._samples[sample_key] = (window_start, count + 1, suppressed_so_far)
+
+        record = {"ts": time.time(), "level": level, "event": event, **fields}
+        if suppressed:
+            record["suppressed"] = suppressed
+        self._enqueue(record)
+
+    def info(self, event: str, **fields):
+        self.log("info", event, **fields)
+
+    def warning(self, event: str, **fields):
+        self.log("warning", event, **fields)
+
+    def error(self, event: str, **fields):
+        self.log("error", event, **fields)
+
+    def _enqueue(self, record):
+        self._ensure_started()
+        if self.drop_policy == BLOCK:
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.drop_policy == DROP_OLDEST:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                lines = [record]
+                # Drain whatever else is queued so each write syscall carries a batch
+                while len(lines) < 512:
+                    try:
+                        lines.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stream = self.stream or sys.stdout
+                stream.write("".join(_dumps(line) + "\n" for line in lines))
+                stream.flush()
+            finally:
+                for _ in range(len(lines)):
+                    self._queue.task_done()
+
+    def flush(self):
+        if self._thread is not None:
+            self._queue.join()
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat()
+    return repr(value)
+
+
+def _dumps(record):
+    return json.dumps(record, default=_default, separators=(",", ":"))
+
+
+logger = AsyncJsonLogger()
@@ -1,8 +1,17 @@
 from typing import Union
 
-from fastapi import Depends, FastAPI, Cookie, Header, HTTPException
+from fastapi import Depends, FastAPI, Cookie, Header, HTTPException, Query, Request
 
-app = FastAPI()
+from controllers.pagination import Pagination
+from controllers.settings import settings
+from controllers.store import OrderedItemStore
+from controllers.metrics import install_metrics
+from controllers.openapi_cache import install_openapi_cache
+from controllers.serialization import app_response_class
+
+app = FastAPI(default_response_class=app_response_class("main2"))
+install_openapi_cache(app, name="main2")
+install_metrics(app, name="main2")
 
 
 # Dependencies - First Steps
@@ -26,13 +35,19 @@ fake_items_db = [
     {"item_name": "Bar"},
     {"item_name": "Baz"}
 ]
-
-
-class CommonQueryParams:
-    def __init__(self, q: Union[str, None] = None, skip: int = 0, limit: int = 100):
+fake_items_store = OrderedItemStore.from_list(fake_items_db)
+
+
+class CommonQueryParams(Pagination):
+    def __init__(
+        self,
+        request: Request,
+        q: Union[str, None] = None,
+        after: Union[str, None] = None,
+        limit: int = Query(default=settings.default_page_size, ge=1),
+    ):
+        super().__init__(request, after, limit)
         self.q = q
-        self.skip = skip
-        self.limit = limit
 
 
 @app.get("/items1/")
@@ -40,8 +55,8 @@ async def read_items(commons: CommonQueryParams = Depends(CommonQueryParams)):
     response = {}
     if commons.q:
         response.update({"q": commons.q})
-    items = fake_items_db[commons.skip: commons.skip + commons.limit]
-    response.update({"items": items})
+    page = commons.paginate(fake_items_store)
+    response.update({"items": page.items, "next": page.next})
     return response
 
 
@@ -50,8 +65,8 @@ async def read_items(commons: CommonQueryParams = Depends()):
     response = {}
     if commons.q:
         response.update({"q": commons.q})
-    items = fake_items_db[commons.skip: commons.skip + commons.limit]
-    response.update({"items": items})
+    page = commons.paginate(fake_items_store)
+    response.update({"items": page.items, "next": page.next})
     return response
 
 
@@ -1,5 +1,9 @@
 from fastapi import Depends, FastAPI, Header, HTTPException
 
+from controllers.metrics import install_metrics
+from controllers.openapi_cache import install_openapi_cache
+from controllers.serialization import app_response_class
+
 
 async def verify_token(x_token: str = Header()):
     if x_token != "fake-super-secret-token":
@@ -12,7 +16,12 @@ async def verify_key(x_key: str = Header()):
     return x_key
 
 
-app = FastAPI(dependencies=[Depends(verify_token), Depends(verify_key)])
+app = FastAPI(
+    dependencies=[Depends(verify_token), Depends(verify_key)],
+    default_response_class=app_response_class("main3"),
+)
+install_openapi_cache(app, name="main3")
+install_metrics(app, name="main3")
 
 
 # Global Dependencies
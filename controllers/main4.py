@@ -4,7 +4,21 @@ from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
 
-app = FastAPI()
+from controllers.cache import TTLCache
+from controllers.passwords import password_hasher
+from controllers.metrics import install_metrics
+from controllers.openapi_cache import install_openapi_cache
+from controllers.serialization import app_response_class
+
+app = FastAPI(default_response_class=app_response_class("main4"))
+install_openapi_cache(app, name="main4")
+install_metrics(app, name="main4")
+
+
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    password_hasher.shutdown()
+
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -58,10 +72,6 @@ fake_users_db = {
 }
 
 
-def fake_hash_password(password: str):
-    return "fakehashed" + password
-
-
 class UserInDB(User):
     hashed_password: str
 
@@ -79,8 +89,21 @@ def fake_decode_token2(token):
     return user
 
 
+# Resolved users by token, so hot clients skip the lookup and model construction
+user_cache = TTLCache(maxsize=10_000, ttl=300)
+
+
+async def load_user(token):
+    return fake_decode_token2(token)
+
+
+def disable_user(username: str):
+    fake_users_db[username]["disabled"] = True
+    user_cache.invalidate_where(lambda user: user.username == username)
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
-    user = fake_decode_token2(token)
+    user = await user_cache.get_or_load(token, load_user)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -102,8 +125,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     if not user_dict:
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     user = UserInDB(**user_dict)
-    hashed_password = fake_hash_password(form_data.password)
-    if not hashed_password == user.hashed_password:
+    if not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect username or password")
 
     return {"access_token": user.username, "token_type": "bearer"}
@@ -0,0 +1,173 @@
+import time
+from bisect import bisect_left
+from typing import Dict, Sequence, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+
+# Metric families. Everything is recorded from the event loop thread, so plain
+# int/float updates are enough and no locks are taken on the hot path.
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name, labels, value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Tuple = (), amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def set(self, labels: Tuple = (), value: float = 0):
+        self.values[labels] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., +Inf count, sum]
+        self.values: Dict[Tuple, list] = {}
+
+    def observe(self, labels: Tuple, value: float):
+        counts = self.values.get(labels)
+        if counts is None:
+            counts = self.values[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def samples(self):
+        for labels, counts in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield self.name + "_bucket", labels + (("le", le),), cumulative
+            yield self.name + "_sum", labels, counts[-1]
+            yield self.name + "_count", labels, cumulative
+
+
+class Registry:
+    def __init__(self):
+        self.families = {}
+
+    def _register(self, family):
+        return self.families.setdefault(family.name, family)
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._register(Gauge(name, help))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for family in self.families.values():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for name, labels, value in family.samples():
+                if labels:
+                    label_str = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+                    lines.append(f"{name}{{{label_str}}} {value}")
+                else:
+                    lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+registry = Registry()
+
+http_requests = registry.counter("http_requests_total", "HTTP requests by route and status code")
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+http_latency = registry.histogram("http_request_duration_seconds", "HTTP request latency")
+http_request_size = registry.histogram("http_request_size_bytes", "HTTP request body size", SIZE_BUCKETS)
+http_response_size = registry.histogram("http_response_size_bytes", "HTTP response body size", SIZE_BUCKETS)
+
+
+class RouteTemplates:
+    def __init__(self, app):
+        self.app = app
+        self._by_endpoint = {}
+        self._route_count = -1
+
+    def lookup(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "<unmatched>"
+        routes = self.app.routes
+        if len(routes) != self._route_count:
+            self._by_endpoint = {id(route.endpoint): route.path_format for route in routes if hasattr(route, "endpoint")}
+            self._route_count = len(routes)
+        return self._by_endpoint.get(id(endpoint), "<unmatched>")
+
+
+class MetricsMiddleware:
+    def __init__(self, app, name: str, templates: RouteTemplates):
+        self.app = app
+        self.name = name
+        self.templates = templates
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        in_flight_labels = (("app", self.name),)
+        state = {"status": 500, "request_bytes": 0, "response_bytes": 0}
+
+        async def counting_receive():
+            message = await receive()
+            state["request_bytes"] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["response_bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        http_in_flight.inc(in_flight_labels)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec(in_flight_labels)
+            route = (("app", self.name), ("method", scope["method"]), ("route", self.templates.lookup(scope)))
+            http_requests.inc(route + (("status", state["status"]),))
+            http_latency.observe(route, elapsed)
+            http_request_size.observe(route, state["request_bytes"])
+            http_response_size.observe(route, state["response_bytes"])
+
+
+async def metrics_endpoint(request: Request):
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+def install_metrics(app: FastAPI, name: str):
+    app.add_middleware(MetricsMiddleware, name=name, templates=RouteTemplates(app))
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
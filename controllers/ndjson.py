@@ -0,0 +1,147 @@
+import inspect
+import json
+from typing import Any, AsyncIterator, Callable, List, Tuple, Type, Union
+
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+
+from controllers.settings import settings
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is optional; stdlib json parses the same lines
+    _loads = json.loads
+
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonlines")
+
+
+class LineTooLong(Exception):
+    pass
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, bytes]]:
+    # Splits a byte stream on newlines as it arrives; only the unfinished
+    # line is buffered. Blank lines are skipped but still counted.
+    buffer = b""
+    line_no = 0
+    skipping = False
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            line_no += 1
+            line = buffer[start:end]
+            start = end + 1
+            if skipping:
+                # Tail of a line that was already reported as too long
+                skipping = False
+                continue
+            if len(line) > max_line_bytes:
+                yield line_no, LineTooLong()
+            elif line.strip():
+                yield line_no, line
+        buffer = buffer[start:]
+        if len(buffer) > max_line_bytes and not skipping:
+            skipping = True
+            yield line_no + 1, LineTooLong()
+        if skipping:
+            buffer = b""
+    if buffer.strip() and not skipping:
+        yield line_no + 1, buffer
+
+
+class IngestSummary:
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.lines = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.errors: List[dict] = []
+
+    def reject(self, line_no: int, errors: List[dict]):
+        self.rejected += 1
+        # Only the first errors are kept, so a bad upload can't grow the response
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_no, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "lines": self.lines,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "errors": self.errors,
+            "errors_truncated": self.rejected > len(self.errors),
+        }
+
+
+# Streaming bulk ingest: validates one NDJSON line at a time against `model`
+# and hands valid rows to `commit` in batches of `batch_size` (without a
+# commit they are only validated and counted). Memory use is bounded by one
+# batch plus one line, whatever the request size.
+async def ingest_ndjson(
+    request: Request,
+    model: Type[BaseModel],
+    commit: Union[Callable[[List[BaseModel]], Any], None] = None,
+    batch_size: int = settings.ndjson_batch_size,
+    max_line_bytes: int = settings.ndjson_max_line_bytes,
+    max_errors: int = settings.ndjson_max_errors,
+) -> dict:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in NDJSON_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected one of: {', '.join(NDJSON_TYPES)}",
+        )
+    summary = IngestSummary(max_errors)
+    batch: List[BaseModel] = []
+
+    async def flush():
+        if commit is not None:
+            result = commit(batch)
+            if inspect.isawaitable(result):
+                await result
+        summary.accepted += len(batch)
+        summary.batches += 1
+        batch.clear()
+
+    async for line_no, line in iter_lines(request.stream(), max_line_bytes):
+        summary.lines = line_no
+        if isinstance(line, LineTooLong):
+            error = {"msg": f"line longer than {max_line_bytes} bytes", "type": "value_error.line_too_long"}
+            summary.reject(line_no, [error])
+            continue
+        try:
+            row = model.parse_obj(_loads(line))
+        except ValidationError as exc:
+            summary.reject(line_no, exc.errors())
+            continue
+        except ValueError:
+            summary.reject(line_no, [{"msg": "invalid JSON", "type": "value_error.jsondecode"}])
+            continue
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return summary.as_dict()
+
+
+def ndjson_openapi(model: Type[BaseModel]):
+    return {
+        "requestBody": {
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {"$ref": f"#/components/schemas/{model.__name__}"},
+                }
+            },
+            "description": f"One {model.__name__} JSON object per line",
+            "required": True,
+        }
+    }
@@ -0,0 +1,297 @@
+import argparse
+import asyncio
+import glob
+import gzip
+import hashlib
+import inspect
+import json
+import mmap
+import os
+import tempfile
+from typing import Dict, List, Tuple
+
+import fastapi
+from fastapi import FastAPI, Request
+from fastapi.openapi.docs import get_swagger_ui_html
+from fastapi.openapi.utils import get_openapi
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from controllers.conditional import etag_matches
+from controllers.logs import logger
+from controllers.settings import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always built
+    brotli = None
+
+CHUNK_SIZE = 64 * 1024
+
+# Every cache created in this process, so the pre-fork master can build and
+# map them all before forking
+caches: List["OpenAPICache"] = []
+
+
+def route_fingerprint(app: FastAPI, root_path: str = "") -> str:
+    # Cheap to compute (no schema generation): the route table plus the size and
+    # mtime of every module that defines an endpoint, so editing a model rebuilds
+    digest = hashlib.sha256()
+    for value in (fastapi.__version__, app.title, app.version, app.description, app.openapi_version, root_path):
+        digest.update(f"{value}\0".encode())
+    sources = set()
+    for route in app.routes:
+        endpoint = getattr(route, "endpoint", None)
+        digest.update(
+            "{}|{}|{}|{}|{}|{}\0".format(
+                type(route).__name__,
+                getattr(route, "path", ""),
+                sorted(getattr(route, "methods", None) or ()),
+                getattr(route, "name", ""),
+                getattr(route, "include_in_schema", False),
+                getattr(endpoint, "__qualname__", ""),
+            ).encode()
+        )
+        module = inspect.getmodule(endpoint) if endpoint is not None else None
+        if module is not None and getattr(module, "__file__", None):
+            sources.add(module.__file__)
+    for path in sorted(sources):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}\0".encode())
+    return digest.hexdigest()[:16]
+
+
+def _write_atomic(path: str, data: bytes):
+    # Workers building the same artifact concurrently each rename a complete file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class SchemaVariant:
+    __slots__ = ("digest", "files", "maps")
+
+    def __init__(self, digest: str, files: Dict[str, str]):
+        self.digest = digest
+        self.files = files
+        self.maps: Dict[str, mmap.mmap] = {}
+        for encoding, path in files.items():
+            with open(path, "rb") as f:
+                self.maps[encoding] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def etag(self, encoding: str) -> str:
+        # Strong validator, one per representation
+        return f'"{self.digest}-{encoding}"'
+
+
+def negotiate(accept_encoding: str, available) -> str:
+    offered = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        offered[coding.strip().lower()] = quality
+    for encoding in ("br", "gzip"):
+        if encoding in available and offered.get(encoding, offered.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+
+# Serves /openapi.json from files built once per route set and memory-mapped,
+# so every worker shares the same page-cache copy instead of generating its own
+class OpenAPICache:
+    def __init__(self, app: FastAPI, name: str, directory: str = None):
+        self.app = app
+        self.name = name
+        self.directory = directory or settings.openapi_cache_dir
+        self.variants: Dict[str, SchemaVariant] = {}
+        # Mount points known up front (the gateway's prefixes), built by load()
+        self.root_paths = {""}
+        self._docs: Dict[str, Tuple[bytes, str]] = {}
+        self._route_count = -1
+        self._building: Dict[str, asyncio.Future] = {}
+
+    def _prefix(self, root_path: str) -> str:
+        # One file set per app and mount point, e.g. main-<fp> or main_main-<fp>
+        return self.name + root_path.replace("/", "_")
+
+    def _paths(self, root_path: str, fingerprint: str) -> Dict[str, str]:
+        base = os.path.join(self.directory, f"{self._prefix(root_path)}-{fingerprint}.json")
+        paths = {"identity": base, "gzip": base + ".gz"}
+        if brotli is not None:
+            paths["br"] = base + ".br"
+        return paths
+
+    def build(self, root_path: str = "") -> SchemaVariant:
+        # Reuses artifacts left by a previous build (or another worker) when the
+        # route fingerprint still matches, otherwise generates and compresses
+        fingerprint = route_fingerprint(self.app, root_path)
+        paths = self._paths(root_path, fingerprint)
+        if not all(os.path.exists(path) for path in paths.values()):
+            os.makedirs(self.directory, exist_ok=True)
+            servers = list(self.app.servers)
+            if root_path and self.app.root_path_in_servers and root_path not in {s.get("url") for s in servers}:
+                servers.insert(0, {"url": root_path})
+            schema = get_openapi(
+                title=self.app.title,
+                version=self.app.version,
+                openapi_version=self.app.openapi_version,
+                description=self.app.description,
+                terms_of_service=self.app.terms_of_service,
+                contact=self.app.contact,
+                license_info=self.app.license_info,
+                routes=self.app.routes,
+                tags=self.app.openapi_tags,
+                servers=servers or None,
+            )
+            # Same encoding as FastAPI's JSONResponse
+            body = json.dumps(schema, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+            # The uncompressed file goes last; a set is only reused once all exist
+            if "br" in paths:
+                _write_atomic(paths["br"], brotli.compress(body, quality=11))
+            _write_atomic(paths["gzip"], gzip.compress(body, compresslevel=9, mtime=0))
+            _write_atomic(paths["identity"], body)
+            self._remove_stale(root_path, paths)
+            logger.info("openapi_built", app=self.name, root_path=root_path, fingerprint=fingerprint, bytes=len(body))
+        with open(paths["identity"], "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:32]
+        return SchemaVariant(digest, paths)
+
+    def _remove_stale(self, root_path: str, current: Dict[str, str]):
+        # Mapped files stay readable after unlink, so old workers are unaffected
+        keep = set(current.values())
+        for path in glob.glob(os.path.join(self.directory, f"{self._prefix(root_path)}-*.json*")):
+            if path not in keep:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def mount(self, prefix: str):
+        self.root_paths.add("/" + prefix.strip("/"))
+
+    def load(self):
+        self.variants = {root_path: self.build(root_path) for root_path in sorted(self.root_paths)}
+        self._docs = {}
+        self._route_count = len(self.app.routes)
+
+    async def variant(self, root_path: str) -> SchemaVariant:
+        if len(self.app.routes) != self._route_count:
+            # Routes were added or removed after startup
+            self.variants = {}
+            self._docs = {}
+            self._route_count = len(self.app.routes)
+        variant = self.variants.get(root_path)
+        if variant is not None:
+            return variant
+        # Single-flight per root path; generation runs off the event loop
+        future = self._building.get(root_path)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._building[root_path] = future
+        try:
+            variant = await run_in_threadpool(self.build, root_path)
+            self.variants[root_path] = variant
+            future.set_result(variant)
+            return variant
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            del self._building[root_path]
+
+    async def openapi(self, request: Request) -> Response:
+        variant = await self.variant(request.scope.get("root_path", "").rstrip("/"))
+        encoding = negotiate(request.headers.get("accept-encoding", ""), variant.maps)
+        etag = variant.etag(encoding)
+        headers = {"etag": etag, "vary": "Accept-Encoding", "cache-control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        data = variant.maps[encoding]
+        headers["content-length"] = str(len(data))
+        if encoding != "identity":
+            headers["content-encoding"] = encoding
+
+        async def chunks():
+            for start in range(0, len(data), CHUNK_SIZE):
+                yield data[start:start + CHUNK_SIZE]
+
+        return StreamingResponse(chunks(), media_type="application/json", headers=headers)
+
+    async def docs(self, request: Request) -> Response:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        cached = self._docs.get(root_path)
+        if cached is None:
+            app = self.app
+            oauth2_redirect_url = app.swagger_ui_oauth2_redirect_url
+            body = get_swagger_ui_html(
+                openapi_url=root_path + app.openapi_url,
+                title=app.title + " - Swagger UI",
+                oauth2_redirect_url=root_path + oauth2_redirect_url if oauth2_redirect_url else None,
+                init_oauth=app.swagger_ui_init_oauth,
+                swagger_ui_parameters=app.swagger_ui_parameters,
+            ).body
+            cached = self._docs[root_path] = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        body, etag = cached
+        headers = {"etag": etag, "cache-control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="text/html", headers=headers)
+
+
+def _replace_route(app: FastAPI, path: str, endpoint):
+    for index, route in enumerate(app.router.routes):
+        if isinstance(route, Route) and route.path == path:
+            app.router.routes[index] = Route(path, endpoint, include_in_schema=False)
+            return
+
+
+def install_openapi_cache(app: FastAPI, name: str) -> OpenAPICache:
+    # Takes over the /openapi.json and /docs routes FastAPI set up; the schema is
+    # built (or picked up from disk) at startup, after all routes are registered
+    cache = OpenAPICache(app, name)
+    if app.openapi_url:
+        _replace_route(app, app.openapi_url, cache.openapi)
+        if app.docs_url:
+            _replace_route(app, app.docs_url, cache.docs)
+        app.add_event_handler("startup", cache.load)
+    app.state.openapi_cache = cache
+    caches.append(cache)
+    return cache
+
+
+def load_all():
+    for cache in caches:
+        cache.load()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the OpenAPI schema cache")
+    parser.add_argument("apps", nargs="+", help="Import paths, e.g. controllers.main:app")
+    args = parser.parse_args()
+
+    # Importing the gateway mounts every app, so their prefixed variants get built too
+    from controllers.gateway import import_app
+
+    for path in args.apps:
+        import_app(path).state.openapi_cache.load()
+    logger.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import base64
+import binascii
+import json
+from typing import List, Union
+
+from fastapi import HTTPException, Query, Request
+
+from controllers.settings import settings
+from controllers.store import OrderedItemStore
+
+
+def encode_cursor(key) -> str:
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, key_type: type = int):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Keys are compared against the store's own keys, so a cursor holding any
+    # other JSON type (bool included) can't be used to seek
+    if type(key) is not key_type:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+class Page:
+    def __init__(self, items: List[dict], next_url: Union[str, None]):
+        self.items = items
+        self.next = next_url
+
+    def link_header(self):
+        return f'<{self.next}>; rel="next"' if self.next else None
+
+
+# Keyset pagination - shared dependency
+class Pagination:
+    def __init__(
+        self,
+        request: Request,
+        after: Union[str, None] = Query(default=None, description="Opaque cursor from the previous page"),
+        limit: int = Query(default=settings.default_page_size, ge=1),
+    ):
+        self.request = request
+        self.after = after
+        self.limit = min(limit, settings.max_page_size)
+
+    def paginate(self, store: OrderedItemStore) -> Page:
+        after = decode_cursor(self.after, store.key_type) if self.after else None
+        # Fetch one extra row to know whether there is a next page
+        rows = store.seek(after, self.limit + 1)
+        next_url = None
+        if len(rows) > self.limit:
+            rows = rows[: self.limit]
+            last_key = rows[-1][0]
+            next_url = str(self.request.url.include_query_params(after=encode_cursor(last_key), limit=self.limit))
+        return Page([row for _, row in rows], next_url)
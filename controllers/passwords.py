@@ -0,0 +1,130 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+
+from controllers.metrics import registry
+from controllers.settings import settings
+
+hash_latency = registry.histogram("password_hash_duration_seconds", "Time to hash or verify a password, queueing included")
+pool_pending = registry.gauge("password_hash_pool_pending", "Hash jobs submitted to the process pool and not finished")
+pool_workers = registry.gauge("password_hash_pool_workers", "Processes in the password hashing pool")
+pool_rejected = registry.counter("password_hash_rejected_total", "Hash jobs rejected because the pool queue was full")
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode()
+
+
+# Runs in the worker processes
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=128 * r * (n + p + 2), dklen=32)
+
+
+class ScryptScheme:
+    name = "scrypt"
+
+    def __init__(self, n: int, r: int, p: int):
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith("scrypt$")
+
+    async def hash(self, hasher: "PasswordHasher", password: str) -> str:
+        salt = os.urandom(16)
+        digest = await hasher.run(_scrypt, password, salt, self.n, self.r, self.p)
+        return f"scrypt${self.n}${self.r}${self.p}${_b64(salt)}${_b64(digest)}"
+
+    async def verify(self, hasher: "PasswordHasher", password: str, encoded: str) -> bool:
+        _, n, r, p, salt, expected = encoded.split("$")
+        digest = await hasher.run(_scrypt, password, base64.b64decode(salt), int(n), int(r), int(p))
+        return hmac.compare_digest(digest, base64.b64decode(expected))
+
+
+# The "fakehashed" + password values of the tutorial's fake databases
+class FakeScheme:
+    name = "fake"
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith("fakehashed")
+
+    async def hash(self, hasher: "PasswordHasher", password: str) -> str:
+        return "fakehashed" + password
+
+    async def verify(self, hasher: "PasswordHasher", password: str, encoded: str) -> bool:
+        return hmac.compare_digest(("fakehashed" + password).encode(), encoded.encode())
+
+
+# Password hashing service; the KDF runs in a bounded process pool so it
+# never blocks the event loop.
+class PasswordHasher:
+    def __init__(self, scheme: str, schemes, max_workers: int, max_pending: int):
+        self.schemes = {item.name: item for item in schemes}
+        self.scheme = self.schemes[scheme]
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            pool_workers.set(value=self.max_workers)
+        return self._pool
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_pending:
+            pool_rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Password hashing is saturated, try again later",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        pool_pending.set(value=self.pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_pool(), func, *args)
+        finally:
+            self.pending -= 1
+            pool_pending.set(value=self.pending)
+
+    async def hash(self, password: str) -> str:
+        start = time.perf_counter()
+        try:
+            return await self.scheme.hash(self, password)
+        finally:
+            hash_latency.observe((("op", "hash"), ("scheme", self.scheme.name)), time.perf_counter() - start)
+
+    async def verify(self, password: str, encoded: str) -> bool:
+        scheme = next((item for item in self.schemes.values() if item.identify(encoded)), None)
+        if scheme is None:
+            return False
+        start = time.perf_counter()
+        try:
+            return await scheme.verify(self, password, encoded)
+        finally:
+            hash_latency.observe((("op", "verify"), ("scheme", scheme.name)), time.perf_counter() - start)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            pool_workers.set(value=0)
+
+
+password_hasher = PasswordHasher(
+    scheme=settings.password_hash_scheme,
+    schemes=[ScryptScheme(settings.scrypt_n, settings.scrypt_r, settings.scrypt_p), FakeScheme()],
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
@@ -0,0 +1,226 @@
+from copy import deepcopy
+from functools import lru_cache
+from typing import Annotated, Any, Callable, Dict, FrozenSet, List, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import (
+    SHAPE_DEFAULTDICT,
+    SHAPE_DEQUE,
+    SHAPE_DICT,
+    SHAPE_FROZENSET,
+    SHAPE_ITERABLE,
+    SHAPE_LIST,
+    SHAPE_MAPPING,
+    SHAPE_SEQUENCE,
+    SHAPE_SET,
+    SHAPE_SINGLETON,
+    SHAPE_TUPLE_ELLIPSIS,
+    FieldInfo,
+    ModelField,
+)
+
+from controllers.encoders import encode_value
+
+
+SEQUENCE_SHAPES = {
+    SHAPE_LIST, SHAPE_SET, SHAPE_FROZENSET, SHAPE_TUPLE_ELLIPSIS, SHAPE_SEQUENCE, SHAPE_ITERABLE, SHAPE_DEQUE,
+}
+MAPPING_SHAPES = {SHAPE_MAPPING, SHAPE_DICT, SHAPE_DEFAULTDICT}
+
+
+def _validator(model, field: ModelField) -> Callable[[Any], Any]:
+    # Full pydantic validation of one field's value, as response_model would do
+    def validate(value):
+        value, errors = field.validate(value, {}, loc=("response", field.name), cls=model)
+        if errors:
+            raise ValidationError([errors], model)
+        return value
+    return validate
+
+
+def _is_exact(field: ModelField) -> Union[Callable[[Any], bool], None]:
+    # A check that a value already has the field's exact type(s), in which
+    # case validation would hand it back unchanged; None when it can't tell
+    type_ = field.type_
+    if type_ is Any:
+        return lambda value: True
+    if not isinstance(type_, type) or field.sub_fields and field.shape == SHAPE_SINGLETON:
+        return None
+    if field.shape == SHAPE_SINGLETON:
+        return lambda value: type(value) is type_
+    if field.shape in SEQUENCE_SHAPES:
+        # Sets must already be sets: validating a list into one drops duplicates
+        containers = (set, frozenset) if field.shape in (SHAPE_SET, SHAPE_FROZENSET) else (list, tuple, set, frozenset)
+        return lambda value: type(value) in containers and all(type(v) is type_ for v in value)
+    if field.shape in MAPPING_SHAPES and field.key_field.type_ in (str, Any):
+        return lambda value: type(value) is dict and all(type(v) is type_ for v in value.values())
+    return None
+
+
+def _converter(model, field: ModelField, by_alias: bool, encode: bool) -> Callable[[Any], Any]:
+    # Turns one trusted value into its output form
+    type_, shape = field.type_, field.shape
+    validate = _validator(model, field)
+    is_exact = _is_exact(field)
+    project = None
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        nested = Projector(type_, by_alias=by_alias, encode=encode)
+        if shape == SHAPE_SINGLETON:
+            project = nested
+        elif shape in SEQUENCE_SHAPES:
+            project = nested.project_many
+        elif shape in MAPPING_SHAPES:
+            def project(value):
+                return {key: nested(item) for key, item in value.items()}
+
+    def convert(value):
+        if value is None:
+            return None if field.allow_none else validate(value)
+        if project is not None:
+            return project(value)
+        # Values of another type (e.g. an int for a float field) are coerced
+        if is_exact is None or not is_exact(value):
+            value = validate(value)
+        return encode_value(value) if encode else value
+    return convert
+
+
+# Precompiled field filter for a response model: applies response_model_*
+# options to trusted handler output without re-validating values that
+# already have the declared type.
+class Projector:
+    def __init__(
+        self,
+        model,
+        include: Union[FrozenSet[str], None] = None,
+        exclude: Union[FrozenSet[str], None] = None,
+        by_alias: bool = True,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+        encode: bool = True,
+    ):
+        self.model = model
+        self.encode = encode
+        self.exclude_unset = exclude_unset
+        self.exclude_defaults = exclude_defaults
+        self.exclude_none = exclude_none
+        self.fields = []
+        for field in model.__fields__.values():
+            if include is not None and field.name not in include:
+                continue
+            if exclude is not None and field.name in exclude:
+                continue
+            output_name = field.alias if by_alias else field.name
+            convert = _converter(model, field, by_alias, encode)
+            self.fields.append((field.name, output_name, field.required, field.default, convert))
+
+    def __call__(self, obj: Any) -> dict:
+        if isinstance(obj, BaseModel):
+            get = obj.__dict__.get
+            present = obj.__fields_set__
+        else:
+            get = obj.get
+            present = obj
+        result = {}
+        for name, output_name, required, default, convert in self.fields:
+            if name in present:
+                value = get(name)
+            elif self.exclude_unset or self.exclude_defaults or required:
+                continue
+            else:
+                # Defaults are output as declared, unvalidated, like pydantic does
+                value = deepcopy(default)
+                if not (self.exclude_none and value is None):
+                    result[output_name] = encode_value(value) if self.encode else value
+                continue
+            if self.exclude_none and value is None:
+                continue
+            if self.exclude_defaults and not required and value == default:
+                continue
+            result[output_name] = convert(value)
+        return result
+
+    def project_many(self, objs) -> List[dict]:
+        return [self(obj) for obj in objs]
+
+    def with_options(self, **options) -> "Projector":
+        return Projector(self.model, **options)
+
+
+# Projector for a discriminated union: picks the member's projector by the tag
+# value in one dict lookup instead of trying each member in turn.
+class TaggedProjector:
+    def __init__(self, tag: str, projectors: Dict[Any, Projector]):
+        self.tag = tag
+        self.projectors = projectors
+
+    @property
+    def fields(self):
+        # Every member's fields, once each
+        seen = {}
+        for projector in self.projectors.values():
+            for field in projector.fields:
+                seen.setdefault(field[1], field)
+        return list(seen.values())
+
+    def __call__(self, obj: Any) -> dict:
+        value = obj.__dict__.get(self.tag) if isinstance(obj, BaseModel) else obj.get(self.tag)
+        projector = self.projectors.get(value)
+        if projector is None:
+            raise ValueError(f"Unknown {self.tag}: {value!r}")
+        return projector(obj)
+
+    def project_many(self, objs) -> List[dict]:
+        return [self(obj) for obj in objs]
+
+    def with_options(self, **options) -> "TaggedProjector":
+        return TaggedProjector(self.tag, {value: p.with_options(**options) for value, p in self.projectors.items()})
+
+
+def literal_value(model, field_name: str):
+    # The single value of a Literal["..."] tag field
+    field = model.__fields__[field_name]
+    values = get_args(field.outer_type_) if get_origin(field.outer_type_) is Literal else ()
+    if len(values) != 1:
+        raise TypeError(f"{model.__name__}.{field_name} must be a single-value Literal")
+    return values[0]
+
+
+def _discriminated_union(annotation):
+    # Annotated[Union[A, B], Field(discriminator="type")] -> ("type", (A, B))
+    if get_origin(annotation) is not Annotated:
+        return None
+    union, *extras = get_args(annotation)
+    tag = next((getattr(extra, "discriminator", None) for extra in extras if isinstance(extra, FieldInfo)), None)
+    if tag is None or get_origin(union) is not Union:
+        return None
+    return tag, get_args(union)
+
+
+@lru_cache(maxsize=None)
+def get_projector(
+    model,
+    include: Union[FrozenSet[str], None] = None,
+    exclude: Union[FrozenSet[str], None] = None,
+    by_alias: bool = True,
+    exclude_unset: bool = False,
+    exclude_defaults: bool = False,
+    exclude_none: bool = False,
+    encode: bool = True,
+) -> Projector:
+    return Projector(model, include, exclude, by_alias, exclude_unset, exclude_defaults, exclude_none, encode)
+
+
+def compile_response_projector(response_model, **options) -> Union[Callable[[Any], Any], None]:
+    if isinstance(response_model, type) and issubclass(response_model, BaseModel):
+        return get_projector(response_model, **options)
+    tagged = _discriminated_union(response_model)
+    if tagged is not None:
+        tag, members = tagged
+        return TaggedProjector(tag, {literal_value(model, tag): get_projector(model, **options) for model in members})
+    if get_origin(response_model) in (list, List):
+        (item_model,) = get_args(response_model)
+        if isinstance(item_model, type) and issubclass(item_model, BaseModel):
+            return get_projector(item_model, **options).project_many
+    return None
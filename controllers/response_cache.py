@@ -0,0 +1,184 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import FastAPI
+from starlette.routing import Match
+
+from controllers.conditional import etag_matches
+from controllers.settings import settings
+
+DEFAULT_VARY = ("accept", "accept-encoding")
+
+
+def cache_response(ttl: float, vary: Iterable[str] = ()):
+    # Declares a GET endpoint as cacheable; goes under the route decorator
+    def decorator(func):
+        func.cache_ttl = ttl
+        func.cache_vary = DEFAULT_VARY + tuple(header.lower() for header in vary)
+        return func
+
+    return decorator
+
+
+class CachedResponse:
+    __slots__ = ("status", "headers", "body", "expires_at", "size", "etag")
+
+    def __init__(self, status: int, headers: list, body: bytes, ttl: float):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires_at = time.monotonic() + ttl
+        self.size = len(body) + sum(len(key) + len(value) for key, value in headers)
+        self.etag = next((value.decode() for key, value in headers if key == b"etag"), None)
+
+
+# Byte-size bounded LRU of complete responses
+class ResponseCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self._by_template: Dict[str, Set[Tuple]] = {}
+        self.inflight: Dict[Tuple, asyncio.Future] = {}
+
+    def get(self, key) -> CachedResponse:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key, entry: CachedResponse):
+        if entry.size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._by_template.setdefault(key[1], set()).add(key)
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        self._by_template[key[1]].discard(key)
+
+    def purge(self, template: str = None, path: str = None):
+        # Drop cached responses for a route template, optionally a single path
+        if template is None:
+            for key in list(self._entries):
+                self._remove(key)
+            return
+        for key in list(self._by_template.get(template, ())):
+            if path is None or key[2] == path:
+                self._remove(key)
+
+    def stats(self):
+        return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+
+response_cache = ResponseCache(settings.response_cache_max_bytes)
+
+
+class ResponseCacheMiddleware:
+    def __init__(self, app, fastapi_app: FastAPI, cache: ResponseCache):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.cache = cache
+        self._routes = None
+        self._route_count = -1
+
+    def _cached_routes(self):
+        routes = self.fastapi_app.routes
+        if len(routes) != self._route_count:
+            self._routes = [route for route in routes if hasattr(getattr(route, "endpoint", None), "cache_ttl")]
+            self._route_count = len(routes)
+        return self._routes
+
+    def _match(self, scope):
+        for route in self._cached_routes():
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+        route = self._match(scope)
+        headers = dict(scope["headers"])
+        if route is None or b"authorization" in headers:
+            return await self.app(scope, receive, send)
+
+        endpoint = route.endpoint
+        query = urlencode(sorted(parse_qsl(scope["query_string"].decode(), keep_blank_values=True)))
+        vary = tuple(headers.get(name.encode(), b"") for name in endpoint.cache_vary)
+        key = ("GET", route.path_format, scope["path"], query, vary)
+
+        entry = self.cache.get(key)
+        if entry is None:
+            pending = self.cache.inflight.get(key)
+            if pending is not None:
+                # Someone else is computing this response, wait for it
+                entry = await asyncio.shield(pending)
+        if entry is not None:
+            self.cache.hits += 1
+            # Lets outer middleware (metrics) see which route was served
+            scope["endpoint"] = endpoint
+            return await self._replay(entry, headers, send)
+
+        self.cache.misses += 1
+        pending = asyncio.get_running_loop().create_future()
+        self.cache.inflight[key] = pending
+        captured = {"status": 500, "headers": [], "body": [], "size": 0}
+
+        async def capturing_send(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = list(message.get("headers", []))
+                message = {**message, "headers": captured["headers"] + [(b"x-cache", b"MISS")]}
+            elif message["type"] == "http.response.body" and captured["body"] is not None:
+                body = message.get("body", b"")
+                captured["size"] += len(body)
+                if captured["size"] > self.cache.max_bytes:
+                    # Too big to ever be cached: stop holding a copy of a streamed response
+                    captured["body"] = None
+                else:
+                    captured["body"].append(body)
+            await send(message)
+
+        entry = None
+        try:
+            await self.app(scope, receive, capturing_send)
+            if captured["status"] == 200 and captured["body"] is not None:
+                entry = CachedResponse(200, captured["headers"], b"".join(captured["body"]), endpoint.cache_ttl)
+                self.cache.set(key, entry)
+        finally:
+            if self.cache.inflight.get(key) is pending:
+                del self.cache.inflight[key]
+            # Waiters fall back to computing it themselves when nothing was cached
+            pending.set_result(entry)
+
+    async def _replay(self, entry: CachedResponse, request_headers: dict, send):
+        if_none_match = request_headers.get(b"if-none-match")
+        if entry.etag and if_none_match and etag_matches(if_none_match.decode(), entry.etag):
+            # A 304 carries the Vary the full response would have had
+            headers = [(b"etag", entry.etag.encode())] + [(key, value) for key, value in entry.headers if key == b"vary"]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": entry.status, "headers": entry.headers + [(b"x-cache", b"HIT")]})
+        await send({"type": "http.response.body", "body": entry.body})
+
+
+def install_response_cache(app: FastAPI, cache: ResponseCache = response_cache):
+    app.add_middleware(ResponseCacheMiddleware, fastapi_app=app, cache=cache)
@@ -0,0 +1,410 @@
+from datetime import datetime, time, timedelta, timezone
+from typing import Union, List, Set, Dict
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request, Response
+from pydantic import BaseModel, Field, HttpUrl
+
+from controllers.catalog import ColumnarCatalog
+from controllers.ndjson import ingest_ndjson, ndjson_openapi
+from controllers.pagination import Pagination
+from controllers.scheduler import SchedulerUnavailable, job_scheduler, to_timestamp
+from controllers.trusted import TrustedRoute
+
+router = APIRouter()
+
+# Echo routes whose output is trusted to match their response_model
+trusted = APIRouter(route_class=TrustedRoute)
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+    is_offer: Union[bool, None] = None
+
+
+@router.put("/items/{item_id}")
+def update_item(item_id: int, item: Item):
+    return {
+        "item_name": item.name,
+        "item_price": item.price,
+        "item_id": item_id
+    }
+
+
+class Item2(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+
+
+@router.post("/items/")
+async def creat_item(item: Item2):
+    item_dict = item.dict()
+    if item.tax:
+        price_with_tax = item.price + item.tax
+        item_dict.update({"price_with_tax": price_with_tax})
+    return item_dict
+
+
+# Bulk-loaded Item2 catalog, stored column by column
+catalog = ColumnarCatalog()
+
+
+def price_filter(
+    price_gt: Union[float, None] = Query(default=None, ge=0),
+    price_lt: Union[float, None] = Query(default=None, gt=0),
+):
+    if price_gt is None and price_lt is None:
+        return catalog
+    return catalog.where(gt=price_gt, lt=price_lt)
+
+
+@router.post("/catalog/", openapi_extra=ndjson_openapi(Item2))
+async def create_catalog_items(request: Request):
+    return await ingest_ndjson(request, Item2, lambda batch: catalog.extend(item.dict() for item in batch))
+
+
+@router.get("/catalog/")
+async def read_catalog_items(response: Response, selection=Depends(price_filter), pagination: Pagination = Depends()):
+    page = pagination.paginate(selection)
+    if page.next:
+        response.headers["Link"] = page.link_header()
+    return page.items
+
+
+@router.get("/catalog/totals")
+async def read_catalog_totals(selection=Depends(price_filter)):
+    return selection.totals()
+
+
+@router.put("/items4/{item_id}")
+async def create_item(item_id: int, item: Item2, q: Union[str, None] = None):
+    result = {"item_id": item_id, **item.dict()}
+    if q:
+        result.update({"q": q})
+    return result
+
+
+class Item3(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+
+
+@router.put("/items20/{item_id}")
+async def update_item(
+    *,
+    item_id: int = Path(title="The ID of the item to get", ge=0, le=1000),
+    q: Union[str, None] = None,
+    item: Union[Item3, None] = None
+):
+    results = {"item_id": item_id}
+    if q:
+        results.update({"q": q})
+    if item:
+        results.update({"item": item})
+    return results
+
+
+class User(BaseModel):
+    username: str
+    full_name: Union[str, None] = None
+
+
+@router.put("/items21/{item_id}")
+async def update_item(item_id: int, item: Item3, user: User):
+    results = {"item_id": item_id, "item": item, "user": user}
+    return results
+
+
+@router.put("/items22/{item_id}")
+async def update_item(item_id: int, item: Item3, user: User, importance: int = Body()):
+    results = {
+        "item_id": item_id,
+        "item": item,
+        "user": user,
+        "importance": importance
+    }
+    return results
+
+
+@router.put("/items23/{item_id}")
+async def update_item(
+    *,
+    item_id: int,
+    item: Item3,
+    user: User,
+    importance: int = Body(gt=0),
+    q: Union[str, None] = None
+):
+    results = {"item_id": item_id, "item": item, "user": user, "importance": importance}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.put("/items24/{item_id}")
+async def update_item(item_id: int, item: Item3 = Body(embed=True)):
+    results = {"item_id": item_id, "item": item}
+    return results
+
+
+class Item4(BaseModel):
+    name: str
+    description: Union[str, None] = Field(
+        default=None, title="The description of the item", max_length=300
+    )
+    price: float = Field(gt=0, description="The price must be greater than zero")
+    tax: Union[float, None] = None
+
+
+@router.put("/items25/{item_id}")
+async def update_item(item_id: int, item: Item4 = Body(embed=True)):
+    results = {"item_id": item_id, "item": item}
+    return results
+
+
+class Item5(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+    tags: List[str] = []
+
+
+@router.put("/items26/{item_id}")
+async def update_item(item_id: int, item: Item5):
+    results = {"item_id": item_id, "item": item}
+    return results
+
+
+class Item6(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+    tags: Set[str] = set()
+
+
+@router.put("/items27/{item_id}")
+async def update_item(item_id: int, item: Item6):
+    results = {"item_id": item_id, "item": item}
+    return results
+
+
+class Image(BaseModel):
+    url: HttpUrl
+    name: str
+
+
+class Item7(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+    tags: Set[str] = set()
+    image: Union[Image, None] = None
+
+
+@router.put("/items28/{item_id}")
+async def update_item(item_id: int, item: Item7):
+    results = {"item_id": item_id, "item": item}
+    return results
+
+
+class Item8(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+    tags: Set[str] = set()
+    images: Union[List[Image], None] = None
+
+
+@router.put("/items29/{item_id}")
+async def update_item(item_id: int, item: Item8):
+    results = {"item_id": item_id, "item": item}
+    return results
+
+
+class Offer(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    items: List[Item8]
+
+
+@trusted.post("/offers/", response_model=Offer)
+async def create_offer(offer: Offer):
+    return offer
+
+
+@trusted.post("/images/multiple/", response_model=List[Image])
+async def create_multiple_images(images: List[Image]):
+    return images
+
+
+# Bulk NDJSON ingest: one object per line, validated as it streams in.
+# Like /offers/ and /images/multiple/ nothing is stored; the summary reports
+# what was accepted.
+@router.post("/offers/bulk", openapi_extra=ndjson_openapi(Offer))
+async def create_offers_bulk(request: Request):
+    return await ingest_ndjson(request, Offer)
+
+
+@router.post("/images/bulk", openapi_extra=ndjson_openapi(Image))
+async def create_images_bulk(request: Request):
+    return await ingest_ndjson(request, Image)
+
+
+@router.post("/index-weights/")
+async def create_index_weights(weights: Dict[int, float]):
+    return weights
+
+
+class Item9(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "name": "Foo",
+                "description": "A very nice Item",
+                "price": 35.4,
+                "tax": 3.2
+            }
+        }
+
+
+@router.put("/items30/{item_id}")
+async def update_item_30(item_id: int, item: Item9):
+    results = {
+        "item_id": item_id,
+        "item": item
+    }
+    return results
+
+
+class Item10(BaseModel):
+    name: str = Field(example="Foo")
+    description: Union[str, None] = Field(default=None, example="A very nice Item")
+    price: float = Field(example=35.4)
+    tax: Union[float, None] = Field(default=None, example=3.2)
+
+
+@router.put("/items31/{item_id}")
+async def update_item(item_id: int, item: Item10):
+    results = {"item_id": item_id, "item": item}
+    return results
+
+
+class Item11(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+
+
+@router.put("/items32/{item_id}")
+async def update_item(
+    item_id: int,
+    item: Item11 = Body(
+        example={
+            "name": "Foo",
+            "description": "A very nice Item",
+            "price": 35.4,
+            "tax": 3.2,
+        },
+    ),
+):
+    results = {"item_id": item_id, "item": item}
+    return results
+
+
+@router.put("/items33/{item_id}")
+async def update_item(
+    *,
+    item_id: int,
+    item: Item11 = Body(
+        examples={
+            "normal": {
+                "summary": "A normal example",
+                "description": "A **normal** item works correctly.",
+                "value": {
+                    "name": "Foo",
+                    "description": "A very nice Item 11",
+                    "price": 35.4,
+                    "tax": 3.2,
+                },
+            },
+            "converted": {
+                "summary": "An example with converted data",
+                "description": "FastAPI can convert price `strings` to actual `numbers` automatically",
+                "value": {
+                    "name": "Bar",
+                    "price": "35.4",
+                },
+            },
+            "invalid": {
+                "summary": "Invalid data is rejected with an error",
+                "value": {
+                    "name": "Baz",
+                    "price": "thirty five point four",
+                },
+            },
+        },
+    ),
+):
+    results = {"item_id": item_id, "item": item}
+    return results
+
+
+@router.put("/items34/{item_id}")
+async def read_items(
+    item_id: UUID,
+    start_datetime: Union[datetime, None] = Body(default=None),
+    end_datetime: Union[datetime, None] = Body(default=None),
+    repeat_at: Union[time, None] = Body(default=None),
+    process_after: Union[timedelta, None] = Body(default=None),
+):
+    start_process = start_datetime + process_after
+    duration = end_datetime - start_process
+    try:
+        next_run = await job_scheduler.submit(
+            str(item_id), to_timestamp(start_process), repeat_at, {"duration": duration.total_seconds()}
+        )
+    except SchedulerUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    return {
+        "item_id": item_id,
+        "start_datetime": start_datetime,
+        "end_datetime": end_datetime,
+        "repeat_at": repeat_at,
+        "process_after": process_after,
+        "start_process": start_process,
+        "duration": duration,
+        "next_run": datetime.fromtimestamp(next_run, timezone.utc),
+    }
+
+
+@router.delete("/items34/{item_id}", status_code=204)
+async def cancel_item_process(item_id: UUID):
+    try:
+        cancelled = await job_scheduler.withdraw(str(item_id))
+    except SchedulerUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    if not cancelled:
+        raise HTTPException(status_code=404, detail="Item not scheduled")
+
+
+router.add_event_handler("startup", job_scheduler.start)
+router.add_event_handler("shutdown", job_scheduler.stop)
+
+
+router.include_router(trusted)
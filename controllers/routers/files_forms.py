@@ -0,0 +1,108 @@
+from typing import Union, List
+
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from fastapi.responses import HTMLResponse
+
+from controllers.uploads import StreamedForm, streamed_form, multipart_openapi, binary
+
+router = APIRouter()
+
+
+# Form Data
+@router.post("/login/")
+async def login(username: str = Form(), password: str = Form()):
+    return {"username": username}
+
+
+# Request Files
+@router.post("/files/", openapi_extra=multipart_openapi({"file": binary}, required=["file"]))
+async def create_file(form: StreamedForm = Depends(streamed_form)):
+    file = form.require_file("file")
+    return {"file_size": file.size, "file_sha256": file.sha256}
+
+
+@router.post("/uploadfile/")
+async def create_upload_file(file: UploadFile):
+    return {
+        "filename": file.filename,
+        "content_type": file.content_type
+    }
+
+
+@router.post("/files2/", openapi_extra=multipart_openapi({"file": binary}, required=[]))
+async def create_file(form: StreamedForm = Depends(streamed_form)):
+    file = form.get_file("file")
+    if not file or not file.size:
+        return {"message": "No file sent"}
+    else:
+        return {"file_size": file.size, "file_sha256": file.sha256}
+
+
+@router.post("/uploadfile2/")
+async def create_upload_file(file: Union[UploadFile, None] = None):
+    if not file:
+        return {"message": "No upload file sent"}
+    else:
+        return {"filename": file.filename}
+
+
+@router.post(
+    "/files3/",
+    openapi_extra=multipart_openapi({"file": {**binary, "description": "A file read as bytes"}}, required=["file"]),
+)
+async def create_file(form: StreamedForm = Depends(streamed_form)):
+    file = form.require_file("file")
+    return {"file_size": file.size, "file_sha256": file.sha256}
+
+
+@router.post("/uploadfile3/")
+async def create_upload_file(
+    file: UploadFile = File(description="A file read as UploadFile"),
+):
+    return {"filename": file.filename}
+
+
+@router.post("/files4/", openapi_extra=multipart_openapi({"files": {"type": "array", "items": binary}}, required=["files"]))
+async def create_files(form: StreamedForm = Depends(streamed_form)):
+    files = form.require_files("files")
+    return {"file_sizes": [file.size for file in files], "file_sha256s": [file.sha256 for file in files]}
+
+
+@router.post("/uploadfiles4/")
+async def create_upload_files(files: List[UploadFile] = File(description="Multiple files as UploadFile")):
+    return {"filenames": [file.filename for file in files]}
+
+
+@router.get("/form")
+async def main():
+    content = """
+    <body>
+        <form action="/files4/" enctype="multipart/form-data" method="post">
+            <input name="files" type="file" multiple>
+            <input type="submit">
+        </form>
+        <form action="/uploadfiles4/" enctype="multipart/form-data" method="post">
+            <input name="files" type="file" multiple>
+            <input type="submit">
+        </form>
+    </body>
+    """
+    return HTMLResponse(content=content)
+
+
+# Request Forms and Files
+@router.post(
+    "/files5/",
+    openapi_extra=multipart_openapi(
+        {"file": binary, "fileb": binary, "token": {"type": "string"}}, required=["file", "fileb", "token"]
+    ),
+)
+async def create_file(form: StreamedForm = Depends(streamed_form)):
+    file = form.require_file("file")
+    fileb = form.require_file("fileb")
+    token = form.require_text("token")
+    return {
+        "file_size": file.size,
+        "token": token,
+        "fileb_content_type": fileb.content_type,
+    }
@@ -0,0 +1,350 @@
+from enum import Enum
+from typing import Union, List
+
+from fastapi import APIRouter, Query, Path, Cookie, Header, Response, Depends
+from pydantic import Required
+
+from controllers.pagination import Pagination
+from controllers.response_cache import cache_response
+from controllers.search import items5_index
+from controllers.settings import settings
+from controllers.store import OrderedItemStore, items5
+
+router = APIRouter()
+
+
+@router.get("/")
+def read_root():
+    return {
+        "Hello": "World"
+    }
+
+
+@router.get("/items/{item_id}")
+def read_item(item_id: int, q: Union[str, None] = None):
+    return {
+        "item_id": item_id,
+        "q": q
+    }
+
+
+@router.get("/users/me")
+async def read_user_me():
+    return {
+        "user_id": "the current user"
+    }
+
+
+@router.get("/users/{user_id}")
+async def read_user(user_id: str):
+    return {
+        "user_id": user_id
+    }
+
+
+class ModelName(str, Enum):
+    alexnet = "alexnet"
+    resnet = "resnet"
+    lenet = "lenet"
+
+
+@router.get("/models/{model_name}")
+@cache_response(ttl=300)
+async def get_model(model_name: ModelName):
+    print(model_name)
+    if model_name is ModelName.alexnet:
+        return {
+            "model_name": model_name,
+            "message": "Deep Learning FTW!"
+        }
+
+    if model_name.value == "lenet":
+        return {
+            "model_name": model_name,
+            "message": "LeCNN all the images"
+        }
+
+    return {
+        "model_name": model_name,
+        "message": "Have some residuals"
+    }
+
+
+@router.get("/files/{file_path:path}")
+async def read_file(file_path: str):
+    return {
+        "file_path": file_path
+    }
+
+
+fake_items_db = [
+    {"item_name": "Foo"},
+    {"item_name": "Bar"},
+    {"item_name": "Baz"}
+]
+fake_items_store = OrderedItemStore.from_list(fake_items_db)
+
+
+@router.get("/items/")
+async def read_item(response: Response, pagination: Pagination = Depends()):
+    page = pagination.paginate(fake_items_store)
+    if page.next:
+        response.headers["Link"] = page.link_header()
+    return page.items
+
+
+@router.get("/items2/{item_id}")
+async def read_item(item_id: str, q: Union[str, None] = None, short: bool = False):
+    item = {"item_id": item_id}
+    if q:
+        item.update({"q": q})
+    if not short:
+        item.update(
+            {"description": "This is an amazing item that has a long description"}
+        )
+    return item
+
+
+@router.get("/users/{user_id}/items/{item_id}")
+async def read_user_item(
+        user_id: int, item_id: str, q: Union[str, None] = None, short: bool = False
+):
+    item = {
+        "item_id": item_id,
+        "owner_id": user_id
+    }
+    if q:
+        item.update({"q": q})
+
+    if not short:
+        item.update(
+            {"description": "This is an amazing item that has a long description"}
+        )
+
+    return item
+
+
+@router.get("/items3/{item_id}")
+async def read_user_item(item_id: str, needy: str, skip: int = 0, limit: Union[int, None] = None):
+    item = {
+        "item_id": item_id,
+        "needy": needy,
+        "skip": skip,
+        "limit": limit
+    }
+    return item
+
+
+@router.get("/items5/")
+async def read_items(q: Union[str, None] = Query(
+    default=None, min_length=3, max_length=50, regex="^fixedquery$"
+)):
+    results = {
+        "items": [
+            {"item_id": "Foo"},
+            {"item_id": "Bar"}
+        ]
+    }
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.get("/items6/")
+async def read_items(q: str = Query(min_length=3)):
+    results = {"items": [
+        {"item_id": "Foo"},
+        {"item_id": "Bar"}
+    ]}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+# ... => el parámetro es requerido
+@router.get("/items7/")
+async def read_items(q: str = Query(default=..., min_length=3)):
+    results = {"items": [
+        {"item_id": "Foo"},
+        {"item_id": "Bar"}
+    ]}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.get("/items8/")
+async def read_items(q: str = Query(default=Required, min_length=3)):
+    results = {"items": [
+        {"item_id": "Foo"},
+        {"item_id": "Bar"}
+    ]}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.get("/items9/")
+async def read_items_list(q: Union[List[str], None] = Query(default=None)):
+    query_items = {"q": q}
+    return query_items
+
+
+@router.get("/items10/")
+async def read_items_list(q: Union[List[str], None] = Query(default=["foo", "bar"])):
+    query_items = {"q": q}
+    return query_items
+
+
+@router.get("/items11/")
+async def read_items(
+    q: Union[str, None] = Query(
+        default=None,
+        title="Query string",
+        description="Query string for the items to search in the database that have a good match",
+        min_length=3
+    ),
+    limit: int = Query(default=settings.default_page_size, ge=1, le=settings.max_page_size),
+):
+    if not q:
+        return {"items": [
+            {"item_id": "Foo"},
+            {"item_id": "Bar"}
+        ]}
+    results = {"items": []}
+    for score, item_id in items5_index.search(q, limit):
+        item = items5.get(item_id)
+        if item is not None:
+            results["items"].append({"item_id": item_id, "score": round(score, 4), **item})
+    results.update({"q": q})
+    return results
+
+
+@router.get("/items12/")
+async def read_items(q: Union[str, None] = Query(default=None, alias="item-query")):
+    results = {"items": [{"item_id": "Foo"}, {"item_id": "Bar"}]}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.get("/items13/")
+async def read_items(
+    q: Union[str, None] = Query(
+        default=None,
+        alias="item-query",
+        title="Query string",
+        description="Query string for the items to search in the database that have a good match",
+        min_length=3,
+        max_length=50,
+        regex="^fixedquery$",
+        deprecated=True,
+    )
+):
+    results = {"items": [
+        {"item_id": "Foo"},
+        {"item_id": "Bar"}
+    ]}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.get("/items14/")
+async def read_items(
+    hidden_query: Union[str, None] = Query(default=None, include_in_schema=False)
+):
+    if hidden_query:
+        return {
+            "hidden_query": hidden_query
+        }
+    else:
+        return {
+            "hidden_query": "Not found"
+        }
+
+
+@router.get("/items15/{item_id}")
+async def read_items(
+        item_id: int = Path(title="The ID of the item to get"),
+        q: Union[str, None] = Query(default=None, alias="item-query")
+):
+    results = {"item_id": item_id}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.get("/items16/{item_id}")
+async def read_items(*, item_id: int = Path(title="The ID of the item to get"), q: str):
+    results = {"item_id": item_id}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.get("/items17/{item_id}")
+async def read_items(
+    *, item_id: int = Path(title="The ID of the item to get", ge=1), q: str
+):
+    results = {"item_id": item_id}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.get("/items18/{item_id}")
+async def read_items(
+    *,
+    item_id: int = Path(title="The ID of the item to get", gt=0, le=1000),
+    q: str,
+):
+    results = {"item_id": item_id}
+    if q:
+        results.update({"q": q})
+    return results
+
+
+@router.get("/items19/{item_id}")
+async def read_items(
+    *,
+    item_id: int = Path(title="The ID of the item to get", ge=0, le=1000),
+    q: str,
+    size: float = Query(gt=0, lt=10.5)
+):
+    results = {
+        "item_id": item_id,
+        "q": q,
+        "size": size
+    }
+    return results
+
+
+# Cookie
+@router.get("/items35/")
+async def read_items(ads_id: Union[str, None] = Cookie(default=None)):
+    return {
+        "ads_id": ads_id
+    }
+
+
+# Header Parameters
+@router.get("/items36/")
+async def read_items(user_agent: Union[str, None] = Header(default=None)):
+    return {
+        "User-Agent": user_agent
+    }
+
+
+@router.get("/items37/")
+async def read_items(strange_header: Union[str, None] = Header(default=None, convert_underscores=False)):
+    return {
+        "strange_header": strange_header
+    }
+
+
+@router.get("/items38/")
+async def read_items(x_token: Union[List[str], None] = Header(default=None)):
+    return {
+        "X-Token values": x_token
+    }
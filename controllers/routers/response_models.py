@@ -0,0 +1,388 @@
+from enum import Enum
+from typing import Union, List, Literal, Set, Dict
+
+from fastapi import APIRouter, Depends, Request, status
+from pydantic import BaseModel, EmailStr
+
+from controllers.batch import add_batch_route
+from controllers.conditional import ETagged
+from controllers.passwords import password_hasher
+from controllers.response_cache import cache_response
+from controllers.store import VersionedStore
+from controllers.streaming import stream_items
+from controllers.trusted import TrustedRoute
+from controllers.unions import TaggedUnion
+
+router = APIRouter()
+
+# Read-heavy routes whose output is trusted to match their response_model
+trusted = APIRouter(route_class=TrustedRoute)
+
+
+# Response Model
+class Item12(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+    tags: List[str] = []
+
+
+@router.post("/items39/", response_model=Item12)
+async def create_item(item: Item12):
+    return item
+
+
+class UserIn(BaseModel):
+    username: str
+    password: str
+    email: EmailStr
+    full_name: Union[str, None] = None
+
+
+# Don't do this in production! (devolver el password en el response)
+@router.post("/user/", response_model=UserIn)
+async def create_user(user: UserIn):
+    return user
+
+
+class UserOut(BaseModel):
+    username: str
+    email: EmailStr
+    full_name: Union[str, None] = None
+
+
+@router.post("/user1/", response_model=UserOut)
+async def create_user(user: UserIn):
+    return user
+
+
+class Item13(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: float = 10.5
+    tags: List[str] = []
+
+
+items = VersionedStore("items", {
+    "foo": {"name": "Foo", "price": 50.2},
+    "bar": {"name": "Bar", "description": "The bartenders", "price": 62, "tax": 20.2},
+    "baz": {"name": "Baz", "description": None, "price": 50.2, "tax": 10.5, "tags": []},
+})
+
+
+@trusted.get(
+    "/items40/{item_id}",
+    response_model=Item13,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(ETagged(items))],
+)
+async def read_item(item_id: str):
+    return items[item_id]
+
+
+@trusted.get(
+    "/items41/{item_id}",
+    response_model=Item13,
+    response_model_exclude_defaults=True,
+    dependencies=[Depends(ETagged(items))],
+)
+async def read_item(item_id: str):
+    return items[item_id]
+
+
+@trusted.get(
+    "/items42/{item_id}",
+    response_model=Item13,
+    response_model_exclude_none=True,
+    dependencies=[Depends(ETagged(items))],
+)
+async def read_item(item_id: str):
+    return items[item_id]
+
+
+class Item14(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: float = 10.5
+
+
+items2 = VersionedStore("items2", {
+    "foo": {"name": "Foo", "price": 50.2},
+    "bar": {"name": "Bar", "description": "The Bar fighters", "price": 62, "tax": 20.2},
+    "baz": {
+        "name": "Baz",
+        "description": "There goes my baz",
+        "price": 50.2,
+        "tax": 10.5,
+    },
+})
+
+
+@trusted.get(
+    "/items43/{item_id}/name",
+    response_model=Item14,
+    response_model_include={"name", "description"},
+    dependencies=[Depends(ETagged(items2))],
+)
+async def read_item_name(item_id: str):
+    return items2[item_id]
+
+
+@trusted.get(
+    "/items44/{item_id}/public",
+    response_model=Item14,
+    response_model_exclude={"tax"},
+    dependencies=[Depends(ETagged(items2))],
+)
+async def read_item_public_data(item_id: str):
+    return items2[item_id]
+
+
+# Batch reads: /items40/?ids=foo,bar,baz
+add_batch_route(router, "/items40/", items, "/items40/{item_id}", trusted)
+add_batch_route(router, "/items41/", items, "/items41/{item_id}", trusted)
+add_batch_route(router, "/items42/", items, "/items42/{item_id}", trusted)
+add_batch_route(router, "/items43/", items2, "/items43/{item_id}/name", trusted)
+add_batch_route(router, "/items44/", items2, "/items44/{item_id}/public", trusted)
+
+
+# Extra Models
+class UserIn2(BaseModel):
+    username: str
+    password: str
+    email: EmailStr
+    full_name: Union[str, None] = None
+
+
+class UserOut2(BaseModel):
+    username: str
+    email: EmailStr
+    full_name: Union[str, None] = None
+
+
+class UserInDB(BaseModel):
+    username: str
+    hashed_password: str
+    email: EmailStr
+    full_name: Union[str, None] = None
+
+
+async def fake_save_user(user_in: UserIn2):
+    hashed_password = await password_hasher.hash(user_in.password)
+    user_in_db = UserInDB(**user_in.dict(), hashed_password=hashed_password)
+    print("User saved! ..not really")
+    return user_in_db
+
+
+@router.post("/user2/", response_model=UserOut2)
+async def create_user(user_in: UserIn2):
+    user_saved = await fake_save_user(user_in)
+    return user_saved
+
+
+class UserBase(BaseModel):
+    username: str
+    email: EmailStr
+    full_name: Union[str, None] = None
+
+
+class UserIn3(UserBase):
+    password: str
+
+
+class UserOut3(UserBase):
+    pass
+
+
+class UserInDB2(UserBase):
+    hashed_password: str
+
+
+async def fake_save_user2(user_in: UserIn3):
+    hashed_password = await password_hasher.hash(user_in.password)
+    user_in_db = UserInDB(**user_in.dict(), hashed_password=hashed_password)
+    print("User saved! ..not really")
+    return user_in_db
+
+
+@router.post("/user3/", response_model=UserOut3)
+async def create_user(user_in: UserIn3):
+    user_saved = await fake_save_user2(user_in)
+    return user_saved
+
+
+class BaseItem(BaseModel):
+    description: str
+    type: str
+
+
+item_types = TaggedUnion(BaseItem, tag="type")
+
+
+class CarItem(BaseItem):
+    type: Literal["car"] = "car"
+
+
+class PlaneItem(BaseItem):
+    type: Literal["plane"] = "plane"
+    size: int
+
+
+# Union[PlaneItem, CarItem] dispatched on "type"
+item_types.register(PlaneItem)
+item_types.register(CarItem)
+AnyItem = item_types.annotation()
+
+
+items3 = VersionedStore("items3", {
+    "item1": {"description": "All my friends drive a low rider", "type": "car"},
+    "item2": {
+        "description": "Music is my aeroplane, it's my aeroplane",
+        "type": "plane",
+        "size": 5,
+    },
+})
+
+
+@trusted.get(
+    "/items45/{item_id}",
+    response_model=AnyItem,
+    responses=item_types.response_openapi(),
+    dependencies=[Depends(ETagged(items3))],
+)
+async def read_item(item_id: str):
+    return items3[item_id]
+
+
+class Item15(BaseModel):
+    name: str
+    description: str
+
+
+items4 = [
+    {"name": "Foo", "description": "There comes my hero"},
+    {"name": "Red", "description": "It's my aeroplane"},
+]
+
+
+@trusted.get("/items46/", response_model=List[Item15])
+@cache_response(ttl=60)
+async def read_items():
+    return items4
+
+
+@router.get("/keyword-weights/", response_model=Dict[str, float])
+@cache_response(ttl=300)
+async def read_keyword_weights():
+    return {"foo": 2.3, "bar": 3.4}
+
+
+# Response Status Code
+@router.post("/items47/", status_code=201)
+async def create_item(name: str):
+    return {"name": name}
+
+
+@router.post("/items48/", status_code=status.HTTP_201_CREATED)
+async def create_item(name: str):
+    return {"name": name}
+
+
+# Path Operation Configuration
+class Item16(BaseModel):
+    name: str
+    description: Union[str, None] = None
+    price: float
+    tax: Union[float, None] = None
+    tags: Set[str] = set()
+
+
+@trusted.post("/items53/", response_model=Item16, status_code=status.HTTP_201_CREATED)
+async def create_item(item: Item16):
+    return item
+
+
+@trusted.post("/items54/", response_model=Item16, tags=["items doc openapi"])
+async def create_item(item: Item16):
+    return item
+
+
+@router.get("/items55/", tags=["items doc openapi"])
+@cache_response(ttl=60)
+async def read_items(request: Request):
+    return stream_items(request, [{"name": "Foo", "price": 42}])
+
+
+@router.get("/users1/", tags=["users doc openapi"])
+async def read_users():
+    return [{"username": "johndoe"}]
+
+
+class Tags(Enum):
+    items = "items"
+    users = "users"
+
+
+@router.get("/items56/", tags=[Tags.items])
+@cache_response(ttl=60)
+async def get_items():
+    return ["Portal gun", "Plumbus"]
+
+
+@router.get("/users2/", tags=[Tags.users])
+async def read_users():
+    return ["Rick", "Morty"]
+
+
+@trusted.post(
+    "/items57/",
+    response_model=Item16,
+    summary="Create an item",
+    description="Create an item with all the information, name, description, price, tax and a set of unique tags",
+)
+async def create_item(item: Item16):
+    return item
+
+
+@trusted.post("/items58/", response_model=Item16, summary="Create an item")
+async def create_item(item: Item16):
+    """
+    Create an item with all the information:
+
+    - **name**: each item must have a name
+    - **description**: a long description
+    - **price**: required
+    - **tax**: if the item doesn't have tax, you can omit this
+    - **tags**: a set of unique tag strings for this item
+    """
+    return item
+
+
+@trusted.post(
+    "/items59/",
+    response_model=Item16,
+    summary="Create an item",
+    response_description="The created item",
+)
+async def create_item(item: Item16):
+    """
+    Create an item with all the information:
+
+    - **name**: each item must have a name
+    - **description**: a long description
+    - **price**: required
+    - **tax**: if the item doesn't have tax, you can omit this
+    - **tags**: a set of unique tag strings for this item
+    """
+    return item
+
+
+@router.get("/elements1/", tags=["items"], deprecated=True)
+async def read_elements():
+    return [{"item_id": "Foo"}]
+
+
+router.include_router(trusted)
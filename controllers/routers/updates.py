@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Union, List
+
+from fastapi import APIRouter, Depends, Response
+from pydantic import BaseModel
+
+from controllers.batch import add_batch_route
+from controllers.conditional import ETagged
+from controllers.encoders import encode_model
+from controllers.response_cache import cache_response, response_cache
+from controllers.store import VersionedStore, items5
+from controllers.trusted import TrustedRoute
+
+router = APIRouter()
+trusted = APIRouter(route_class=TrustedRoute)
+
+
+# JSON Compatible Encoder
+fake_db = VersionedStore("fake_db")
+
+
+class Item17(BaseModel):
+    title: str
+    timestamp: datetime
+    description: Union[str, None] = None
+
+
+@router.put("/items60/{id}")
+def update_item(id: str, item: Item17):
+    json_compatible_item_data = encode_model(item)
+    fake_db[id] = json_compatible_item_data
+    print(fake_db)
+
+
+# Body Updates
+class Item18(BaseModel):
+    name: Union[str, None] = None
+    description: Union[str, None] = None
+    price: Union[float, None] = None
+    tax: float = 10.5
+    tags: List[str] = []
+
+
+@trusted.get("/items61/{item_id}", response_model=Item18, dependencies=[Depends(ETagged(items5))])
+@cache_response(ttl=30)
+async def read_item(item_id: str):
+    return items5[item_id]
+
+
+add_batch_route(router, "/items61/", items5, "/items61/{item_id}", trusted)
+
+
+@router.put("/items62/{item_id}", response_model=Item18)
+async def update_item(item_id: str, item: Item18, response: Response):
+    update_item_encoded = encode_model(item)
+    items5[item_id] = update_item_encoded
+    # Only purges this process's cache: under the pre-fork server (serve.py)
+    # other workers keep serving their cached /items61 until its 30s TTL ends
+    response_cache.purge("/items61/{item_id}", path=f"/items61/{item_id}")
+    response.headers["ETag"] = items5.etag(item_id)
+    return update_item_encoded
+
+
+# Built per merge: get_default() copies mutable defaults, so patched rows never share a tags list
+def item18_defaults() -> dict:
+    return {name: field.get_default() for name, field in Item18.__fields__.items()}
+
+
+@router.patch("/items63/{item_id}", response_model=Item18)
+async def update_item(item_id: str, item: Item18, response: Response):
+    item_encoded = encode_model(item)
+    update_data = {name: item_encoded[name] for name in item.__fields_set__}
+    # Copy-on-write merge under the key's lock, so concurrent patches don't lose updates
+    _, updated_item = await items5.update(
+        item_id, lambda stored_item_data: {**item18_defaults(), **stored_item_data, **update_data}
+    )
+    # Per process, like the purge in /items62 above
+    response_cache.purge("/items61/{item_id}", path=f"/items61/{item_id}")
+    response.headers["ETag"] = items5.etag(item_id)
+    return updated_item
+
+
+router.include_router(trusted)
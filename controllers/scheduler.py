@@ -0,0 +1,444 @@
+import asyncio
+import fcntl
+import heapq
+import itertools
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, time as time_of_day, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
+
+from controllers.logs import logger
+from controllers.metrics import registry
+from controllers.settings import settings
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0)
+
+scheduler_pending = registry.gauge("scheduler_pending_jobs", "Jobs waiting for their due time")
+scheduler_backlog = registry.gauge("scheduler_backlog_seconds", "How overdue the oldest job waiting for a run slot is")
+scheduler_running = registry.gauge("scheduler_running_jobs", "Jobs currently running")
+scheduler_lag = registry.histogram("scheduler_lag_seconds", "Delay between a job's due time and its start", LAG_BUCKETS)
+scheduler_runs = registry.counter("scheduler_runs_total", "Job runs by outcome")
+
+
+def to_timestamp(value: datetime) -> float:
+    # Naive datetimes are taken as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def next_daily(at: time_of_day, after: float) -> float:
+    # Next occurrence of a time of day (UTC unless it carries a tzinfo) after a timestamp
+    tz = at.tzinfo or timezone.utc
+    now = datetime.fromtimestamp(after, tz)
+    candidate = datetime.combine(now.date(), at.replace(tzinfo=None), tzinfo=tz)
+    if candidate.timestamp() <= after:
+        candidate += timedelta(days=1)
+    return candidate.timestamp()
+
+
+class Job:
+    __slots__ = ("id", "due", "repeat_at", "payload", "generation")
+
+    def __init__(self, id: str, due: float, repeat_at: Union[time_of_day, None], payload: dict, generation: int):
+        self.id = id
+        self.due = due
+        self.repeat_at = repeat_at
+        self.payload = payload
+        self.generation = generation
+
+    def as_dict(self):
+        return _job_entry(self.id, self.due, self.repeat_at, self.payload)
+
+
+def _job_entry(id: str, due: float, repeat_at: Union[time_of_day, None], payload: dict) -> dict:
+    return {"id": id, "due": due, "repeat_at": repeat_at.isoformat() if repeat_at else None, "payload": payload}
+
+
+class SchedulerUnavailable(Exception):
+    pass
+
+
+async def log_job(job: Job):
+    logger.info("job_run", job_id=job.id, due=job.due, **job.payload)
+
+
+# Timer heap with lazy cancellation: schedule/reschedule push a new entry
+# (O(log n)) and cancel only drops the job from the index (O(1)); heap entries
+# whose generation no longer matches are skipped when they surface, and the
+# heap is rebuilt once stale entries outnumber live ones.
+#
+# One dispatcher task sleeps until the earliest due time and starts jobs with
+# at most `concurrency` running at once. Every change is numbered and appended
+# to "<state_path>.log" every `flush_interval` seconds, off the event loop, so
+# a flush costs the changes since the last one, not the whole job set. Once
+# the log outgrows the job set it is compacted into a snapshot at state_path
+# (temp file + os.replace; the snapshot records the last change it covers, so
+# log entries it already contains are skipped on load), as also at shutdown.
+#
+# Only one process runs jobs for a given state file: the one holding an
+# exclusive lock on "<state_path>.lock". That leader also serves schedule and
+# cancel calls on the "<state_path>.sock" unix socket; every other process
+# (e.g. the other pre-fork workers) forwards its calls there with submit() and
+# withdraw(), and keeps retrying the lock so it can take over once the
+# leader exits. An empty state_path turns persistence and leadership off.
+class Scheduler:
+    def __init__(
+        self,
+        handler: Callable[[Job], Awaitable[Any]] = log_job,
+        concurrency: int = settings.scheduler_concurrency,
+        state_path: str = settings.scheduler_state_path,
+        flush_interval: float = settings.scheduler_flush_interval,
+    ):
+        self.handler = handler
+        self.concurrency = concurrency
+        self.state_path = state_path
+        self.flush_interval = flush_interval
+        self.jobs: Dict[str, Job] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._sequence = itertools.count()
+        self._generations = itertools.count(1)
+        self._wakeup: Union[asyncio.Event, None] = None
+        self._slots: Union[asyncio.Semaphore, None] = None
+        self._tasks: set = set()
+        self._dispatcher: Union[asyncio.Task, None] = None
+        self._flusher: Union[asyncio.Task, None] = None
+        self._journal: List[dict] = []
+        self._seq = 0
+        self._log_entries = 0
+        self._snapshot_due = False
+        self._write: Union[asyncio.Future, None] = None
+        self.leader = False
+        self._lock_file = None
+        self._server: Union[asyncio.AbstractServer, None] = None
+        self._campaign: Union[asyncio.Task, None] = None
+
+    @property
+    def socket_path(self) -> str:
+        return self.state_path + ".sock"
+
+    @property
+    def log_path(self) -> str:
+        return self.state_path + ".log"
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def __contains__(self, job_id):
+        return job_id in self.jobs
+
+    def schedule(self, job_id: str, due: float, repeat_at: Union[time_of_day, None] = None, payload: dict = None) -> Job:
+        # Replaces any pending job with the same id
+        job = Job(job_id, due, repeat_at, payload or {}, next(self._generations))
+        self.jobs[job_id] = job
+        self._push(job)
+        self._changed({"op": "schedule", **job.as_dict()})
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        if self.jobs.pop(job_id, None) is None:
+            return False
+        self._changed({"op": "cancel", "id": job_id})
+        if len(self._heap) > 2 * len(self.jobs) + 1024:
+            self._compact()
+        return True
+
+    def _push(self, job: Job):
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (job.due, next(self._sequence), job.id, job.generation))
+        if self._wakeup is not None and (earliest is None or job.due < earliest):
+            self._wakeup.set()
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if self._is_live(entry)]
+        heapq.heapify(self._heap)
+
+    def _is_live(self, entry) -> bool:
+        job = self.jobs.get(entry[2])
+        return job is not None and job.generation == entry[3]
+
+    def _changed(self, entry: dict):
+        if self.state_path:
+            self._seq += 1
+            entry["seq"] = self._seq
+            self._journal.append(entry)
+        scheduler_pending.set(value=len(self.jobs))
+
+    def _next_due(self) -> Union[float, None]:
+        # Drops stale entries sitting on top of the heap
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _pop_due(self, now: float) -> Union[Job, None]:
+        next_due = self._next_due()
+        if next_due is None or next_due > now:
+            return None
+        job = self.jobs[heapq.heappop(self._heap)[2]]
+        if job.repeat_at is not None:
+            # The next occurrence is scheduled before this one runs
+            run = Job(job.id, job.due, job.repeat_at, job.payload, job.generation)
+            job.due = next_daily(job.repeat_at, max(now, job.due))
+            job.generation = next(self._generations)
+            self._push(job)
+            self._changed({"op": "schedule", **job.as_dict()})
+            return run
+        del self.jobs[job.id]
+        self._changed({"op": "cancel", "id": job.id})
+        return job
+
+    async def _dispatch(self):
+        while True:
+            self._wakeup.clear()
+            next_due = self._next_due()
+            now = time.time()
+            if next_due is None or next_due > now:
+                scheduler_backlog.set(value=0)
+                timeout = None if next_due is None else next_due - now
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            # Oldest due job not started yet; grows while every slot is busy
+            scheduler_backlog.set(value=now - next_due)
+            await self._slots.acquire()
+            # Re-checked after the wait: the job may have been cancelled meanwhile
+            job = self._pop_due(time.time())
+            if job is None:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: Job):
+        scheduler_lag.observe((), max(time.time() - job.due, 0))
+        scheduler_running.inc()
+        try:
+            await self.handler(job)
+            scheduler_runs.inc((("outcome", "ok"),))
+        except Exception as exc:
+            scheduler_runs.inc((("outcome", "error"),))
+            logger.error("job_failed", job_id=job.id, error=repr(exc))
+        finally:
+            scheduler_running.dec()
+            self._slots.release()
+
+    # Persistence
+    def dump(self) -> dict:
+        return {"seq": self._seq, "jobs": [job.as_dict() for job in self.jobs.values()]}
+
+    def _append_log(self, entries: List[dict]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        with open(self.log_path, "a") as f:
+            f.write("".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_snapshot(self, jobs: List[tuple], seq: int):
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"seq": seq, "jobs": [_job_entry(*job) for job in jobs]}, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.state_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        # Everything up to seq is in the snapshot now, the log starts over
+        open(self.log_path, "w").close()
+
+    async def flush(self, compact: bool = False):
+        if self._write is not None and not self._write.done():
+            # A flush cancelled mid-write leaves its thread running; never overlap it
+            await asyncio.wait([self._write])
+        if not self.state_path:
+            return
+        entries, self._journal = self._journal, []
+        compact = compact or self._snapshot_due or self._log_entries + len(entries) > 2 * len(self.jobs) + 1024
+        if not entries and not compact:
+            return
+        loop = asyncio.get_running_loop()
+        if compact:
+            # Only the copy is taken on the loop; encoding and fsync run in a thread
+            jobs = [(job.id, job.due, job.repeat_at, job.payload) for job in self.jobs.values()]
+            self._write = loop.run_in_executor(None, self._write_snapshot, jobs, self._seq)
+            self._log_entries = 0
+        else:
+            self._write = loop.run_in_executor(None, self._append_log, entries)
+            self._log_entries += len(entries)
+        self._snapshot_due = False
+        try:
+            await asyncio.shield(self._write)
+        except OSError as exc:
+            # What didn't reach the disk is covered by a full snapshot next time
+            self._snapshot_due = True
+            logger.error("scheduler_save_failed", error=repr(exc))
+
+    def load(self):
+        if not self.state_path:
+            return
+        seq = 0
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                state = json.load(f)
+            seq = state.get("seq", 0)
+            for entry in state["jobs"]:
+                self._restore(entry)
+        replayed = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn last append from a crash: rewrite a clean snapshot first thing
+                        self._snapshot_due = True
+                        break
+                    replayed += 1
+                    if entry["seq"] <= seq:
+                        continue
+                    seq = entry["seq"]
+                    if entry["op"] == "schedule":
+                        self._restore(entry)
+                    else:
+                        self.jobs.pop(entry["id"], None)
+        self._seq = seq
+        self._log_entries = replayed
+        self._journal = []
+        scheduler_pending.set(value=len(self.jobs))
+        logger.info("scheduler_loaded", jobs=len(self.jobs))
+
+    def _restore(self, entry: dict):
+        repeat_at = time_of_day.fromisoformat(entry["repeat_at"]) if entry["repeat_at"] else None
+        # Jobs that came due while the process was down run right away
+        self.schedule(entry["id"], entry["due"], repeat_at, entry["payload"])
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    # Leadership
+    def _try_lock(self) -> bool:
+        if not self.state_path:
+            return True
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        lock_file = open(self.state_path + ".lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    async def _lead(self):
+        self.leader = True
+        self.load()
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        self._flusher = asyncio.create_task(self._flush_periodically())
+        if self.state_path:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self._server = await asyncio.start_unix_server(self._serve_follower, path=self.socket_path)
+        logger.info("scheduler_leader", pid=os.getpid(), jobs=len(self.jobs))
+
+    async def _try_lead(self) -> bool:
+        if not self.leader and self._try_lock():
+            await self._lead()
+        return self.leader
+
+    async def _campaign_for_leadership(self):
+        while not await self._try_lead():
+            await asyncio.sleep(settings.scheduler_leader_retry)
+
+    async def _serve_follower(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                writer.write(json.dumps(self._apply(json.loads(line))).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _apply(self, request: dict) -> dict:
+        if request["op"] == "schedule":
+            repeat_at = time_of_day.fromisoformat(request["repeat_at"]) if request["repeat_at"] else None
+            return {"due": self.schedule(request["id"], request["due"], repeat_at, request["payload"]).due}
+        return {"cancelled": self.cancel(request["id"])}
+
+    async def _call(self, request: dict) -> dict:
+        # Runs the request on the leader, becoming it if there is none
+        deadline = time.monotonic() + settings.scheduler_leader_timeout
+        while True:
+            if self.leader or await self._try_lead():
+                return self._apply(request)
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path)
+                try:
+                    writer.write(json.dumps(request).encode() + b"\n")
+                    line = await asyncio.wait_for(reader.readline(), settings.scheduler_leader_timeout)
+                finally:
+                    writer.close()
+                if line:
+                    return json.loads(line)
+            except (OSError, asyncio.TimeoutError):
+                pass
+            # Leader gone (or not listening yet): retry until one answers
+            if time.monotonic() > deadline:
+                raise SchedulerUnavailable("No scheduler leader is reachable")
+            await asyncio.sleep(0.05)
+
+    async def submit(self, job_id: str, due: float, repeat_at: Union[time_of_day, None] = None, payload: dict = None) -> float:
+        # schedule() on the leader, from any process; returns the job's due time
+        request = {
+            "op": "schedule",
+            "id": job_id,
+            "due": due,
+            "repeat_at": repeat_at.isoformat() if repeat_at else None,
+            "payload": payload or {},
+        }
+        return (await self._call(request))["due"]
+
+    async def withdraw(self, job_id: str) -> bool:
+        # cancel() on the leader, from any process
+        return (await self._call({"op": "cancel", "id": job_id}))["cancelled"]
+
+    # Lifecycle, wired as startup/shutdown handlers
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        if not await self._try_lead():
+            self._campaign = asyncio.create_task(self._campaign_for_leadership())
+
+    async def stop(self):
+        for task in (self._campaign, self._dispatcher, self._flusher):
+            if task is not None:
+                task.cancel()
+        self._campaign = self._dispatcher = self._flusher = None
+        if not self.leader:
+            return
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        if self._tasks:
+            await asyncio.wait(self._tasks, timeout=settings.scheduler_shutdown_timeout)
+        await self.flush(compact=True)
+        # Releasing the lock lets a follower take over
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self.leader = False
+
+
+job_scheduler = Scheduler()
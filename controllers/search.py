@@ -0,0 +1,156 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Set, Tuple
+
+from controllers.store import VersionedStore, items5
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(term: str) -> Set[str]:
+    # Padded so short terms and word boundaries still produce grams
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# In-memory full-text index over item rows: an inverted index scored with
+# BM25 (field-weighted term frequencies), plus a trigram index over the
+# vocabulary that maps misspelled query terms to close indexed terms.
+# Queries only touch the postings of their terms; top-k comes from a heap.
+class SearchIndex:
+    def __init__(
+        self,
+        fields: Dict[str, float] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        min_similarity: float = 0.35,
+        max_expansions: int = 3,
+    ):
+        # Field name -> weight of a term occurrence in that field
+        self.fields = fields or {"name": 3.0, "description": 1.0, "tags": 2.0}
+        self.k1 = k1
+        self.b = b
+        self.min_similarity = min_similarity
+        self.max_expansions = max_expansions
+        self._postings: Dict[str, Dict[Any, float]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._doc_terms: Dict[Any, Dict[str, float]] = {}
+        self._doc_length: Dict[Any, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def __contains__(self, key):
+        return key in self._doc_terms
+
+    def _analyze(self, row: dict) -> Dict[str, float]:
+        weighted: Dict[str, float] = Counter()
+        for field, weight in self.fields.items():
+            value = row.get(field)
+            if not value:
+                continue
+            if isinstance(value, str):
+                tokens = tokenize(value)
+            else:
+                tokens = [token for entry in value for token in tokenize(str(entry))]
+            for token in tokens:
+                weighted[token] += weight
+        return weighted
+
+    def add(self, key, row: dict):
+        if key in self._doc_terms:
+            self.remove(key)
+        terms = self._analyze(row)
+        self._doc_terms[key] = terms
+        length = sum(terms.values())
+        self._doc_length[key] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                for gram in trigrams(term):
+                    self._trigrams.setdefault(gram, set()).add(term)
+            postings[key] = frequency
+
+    def remove(self, key):
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_length.pop(key)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                # Last document with this term: drop it from the vocabulary too
+                del self._postings[term]
+                for gram in trigrams(term):
+                    grams = self._trigrams[gram]
+                    grams.discard(term)
+                    if not grams:
+                        del self._trigrams[gram]
+
+    def on_write(self, key, row):
+        # VersionedStore listener: row is None when the key was deleted
+        if row is None:
+            self.remove(key)
+        else:
+            self.add(key, row)
+
+    def attach(self, store: VersionedStore):
+        for key, row in store.items():
+            self.add(key, row)
+        store.subscribe(self.on_write)
+
+    def similar_terms(self, term: str) -> List[Tuple[float, str]]:
+        # Jaccard similarity over trigrams, counted only across terms sharing one
+        grams = trigrams(term)
+        shared: Dict[str, int] = Counter()
+        for gram in grams:
+            for candidate in self._trigrams.get(gram, ()):
+                shared[candidate] += 1
+        scored = (
+            (count / (len(grams) + len(trigrams(candidate)) - count), candidate)
+            for candidate, count in shared.items()
+        )
+        return heapq.nlargest(
+            self.max_expansions, (item for item in scored if item[0] >= self.min_similarity)
+        )
+
+    def expand(self, query: str) -> Dict[str, float]:
+        # Query term -> weight; unknown terms are replaced by their closest matches
+        expanded: Dict[str, float] = {}
+        for token in tokenize(query):
+            if token in self._postings:
+                expanded[token] = max(expanded.get(token, 0.0), 1.0)
+                continue
+            for similarity, term in self.similar_terms(token):
+                expanded[term] = max(expanded.get(term, 0.0), similarity)
+        return expanded
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[float, Any]]:
+        documents = len(self._doc_terms)
+        if not documents:
+            return []
+        average_length = self._total_length / documents or 1.0
+        scores: Dict[Any, float] = {}
+        for term, query_weight in self.expand(query).items():
+            postings = self._postings[term]
+            frequency = len(postings)
+            idf = math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+            for key, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_length[key] / average_length)
+                scores[key] = scores.get(key, 0.0) + query_weight * idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(limit, ((score, key) for key, score in scores.items()), key=lambda item: item[0])
+
+
+# Kept current by the store's write hook, so /items62 and /items63 reindex as they write
+items5_index = SearchIndex()
+items5_index.attach(items5)
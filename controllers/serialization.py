@@ -0,0 +1,94 @@
+import importlib
+import json
+from functools import lru_cache
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Type
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from controllers.encoders import encode_model, encode_value
+from controllers.settings import settings
+
+
+def _default(value: Any) -> Any:
+    # Called by the backends for whatever they can't serialize natively
+    if isinstance(value, BaseModel):
+        return encode_model(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value) if isinstance(value, UUID) else float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, Enum):
+        return value.value
+    return encode_value(value)
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def _load_orjson():
+    orjson = importlib.import_module("orjson")
+    options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=options)
+
+    return dumps
+
+
+_LOADERS: Dict[str, Callable[[], Callable[[Any], bytes]]] = {
+    "orjson": _load_orjson,
+    "stdlib": lambda: _stdlib_dumps,
+}
+_FALLBACK_ORDER = ("orjson", "stdlib")
+
+
+def load_backend(name: str):
+    if name != "auto" and name not in _LOADERS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    # Requested backend first, then the fastest one that is installed
+    order = _FALLBACK_ORDER if name == "auto" else (name,) + _FALLBACK_ORDER[_FALLBACK_ORDER.index(name) + 1:]
+    for candidate in order:
+        try:
+            return candidate, _LOADERS[candidate]()
+        except ImportError:
+            continue
+    return "stdlib", _stdlib_dumps
+
+
+@lru_cache(maxsize=None)
+def make_response_class(backend: str = settings.json_backend) -> Type[JSONResponse]:
+    name, dumps = load_backend(backend)
+
+    class FastJSONResponse(JSONResponse):
+        json_backend = name
+        # datetime, UUID, Decimal, sets and models are handled at render time,
+        # so callers may pass them without running an encoder first
+        handles_native_types = True
+        # Also used directly by the streaming responses, one item at a time
+        encode = staticmethod(dumps)
+
+        def render(self, content: Any) -> bytes:
+            return dumps(content)
+
+    return FastJSONResponse
+
+
+def app_response_class(app_name: str) -> Type[JSONResponse]:
+    # default_response_class for one app: its json_backends entry, else json_backend
+    return make_response_class(settings.json_backends.get(app_name, settings.json_backend))
+
+
+# Process-wide default, for code that has no app at hand
+JSONBackendResponse = make_response_class()
@@ -0,0 +1,153 @@
+import argparse
+import gc
+import os
+import random
+import resource
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from controllers.openapi_cache import load_all
+from controllers.settings import settings
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Peak rather than current RSS, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class WorkerServer(uvicorn.Server):
+    def __init__(self, config: uvicorn.Config, max_rss_bytes: int = 0):
+        super().__init__(config)
+        self.max_rss_bytes = max_rss_bytes
+
+    async def on_tick(self, counter: int) -> bool:
+        should_exit = await super().on_tick(counter)
+        # Checked every 5s; the master forks a fresh worker once this one exits
+        if not should_exit and self.max_rss_bytes and counter % 50 == 0 and rss_bytes() > self.max_rss_bytes:
+            print(f"Worker {os.getpid()} over RSS limit, recycling", file=sys.stderr)
+            return True
+        return should_exit
+
+
+def _run_worker(app, sock: socket.socket, max_requests: int, max_rss_bytes: int):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(
+        app,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        limit_max_requests=max_requests or None,
+    )
+    WorkerServer(config, max_rss_bytes).run(sockets=[sock])
+
+
+# Pre-fork server: the app is imported once in this (master) process and the
+# workers are forked from it, sharing its memory pages copy-on-write and the
+# listening socket. Workers that exit (request or RSS limit) are replaced.
+# In-process state is not shared after the fork: each worker has its own
+# stores and response cache, and a write's cache purge only reaches the worker
+# that handled it, so the others can serve the old response until its TTL.
+def serve(
+    app,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = None,
+    max_requests: int = settings.serve_max_requests,
+    max_requests_jitter: int = settings.serve_max_requests_jitter,
+    max_rss_mb: int = settings.serve_max_rss_mb,
+):
+    workers = workers or settings.serve_workers or os.cpu_count() or 1
+    sock = bind_socket(host, port)
+
+    # Build (or pick up) the OpenAPI schema files once, before forking
+    load_all()
+
+    # Move everything imported so far out of the GC's reach, so collections in
+    # the workers don't touch (and un-share) the inherited pages
+    gc.collect()
+    gc.freeze()
+
+    children = set()
+    stopping = False
+
+    def spawn():
+        # Jitter keeps workers from all recycling at the same moment
+        limit = max_requests + random.randint(0, max_requests_jitter) if max_requests else 0
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _run_worker(app, sock, limit, max_rss_mb * 1024 * 1024)
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+    print(f"Serving on http://{host}:{port} with {workers} workers", file=sys.stderr)
+
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            time.sleep(0.1)
+            spawn()
+    sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fork production server")
+    parser.add_argument("app", help="Import path, e.g. controllers.gateway:app")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-requests", type=int, default=settings.serve_max_requests)
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.serve_max_requests_jitter)
+    parser.add_argument("--max-rss-mb", type=int, default=settings.serve_max_rss_mb)
+    args = parser.parse_args()
+
+    from controllers.gateway import import_app
+
+    serve(
+        import_app(args.app),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        max_rss_mb=args.max_rss_mb,
+    )
+
+
+if __name__ == "__main__":
+    main()
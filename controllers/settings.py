@@ -0,0 +1,78 @@
+from typing import Dict, List
+
+from pydantic import BaseSettings
+
+
+class Settings(BaseSettings):
+    # Router modules mounted by controllers.main
+    main_routers: List[str] = ["path_query", "body", "response_models", "files_forms", "updates"]
+
+    # Production server (0 = CPU count / disabled)
+    serve_workers: int = 0
+    serve_max_requests: int = 0
+    serve_max_requests_jitter: int = 0
+    serve_max_rss_mb: int = 0
+
+    # Prebuilt OpenAPI schema files, keyed by route fingerprint
+    openapi_cache_dir: str = ".openapi_cache"
+
+    # Response serialization: auto, orjson or stdlib; json_backends overrides
+    # it per app name, e.g. JSON_BACKENDS='{"main2": "stdlib"}'
+    json_backend: str = "auto"
+    json_backends: Dict[str, str] = {}
+
+    # Streaming list responses: lists this long (or iterators) are sent in chunks
+    stream_min_items: int = 1000
+    stream_chunk_bytes: int = 64 * 1024
+
+    # Pagination
+    default_page_size: int = 10
+    max_page_size: int = 100
+
+    # Job scheduler (PUT /items34)
+    scheduler_concurrency: int = 100
+    scheduler_state_path: str = ".scheduler/jobs.json"
+    scheduler_flush_interval: float = 1.0
+    scheduler_shutdown_timeout: float = 10.0
+    # How often non-leader processes retry the leader lock / wait for a leader
+    scheduler_leader_retry: float = 1.0
+    scheduler_leader_timeout: float = 5.0
+
+    # Batch reads (?ids=a,b,c)
+    batch_max_ids: int = 500
+
+    # Streaming uploads
+    upload_spool_threshold: int = 1024 * 1024
+    upload_max_request_bytes: int = 1024 * 1024 * 1024
+    upload_max_inflight_bytes: int = 2 * 1024 * 1024 * 1024
+
+    # NDJSON bulk ingest
+    ndjson_batch_size: int = 500
+    ndjson_max_line_bytes: int = 1024 * 1024
+    ndjson_max_errors: int = 100
+
+    # Structured logging
+    log_queue_size: int = 10_000
+    log_drop_policy: str = "drop_new"
+    log_sample_window: float = 1.0
+    log_sample_burst: int = 5
+
+    # Response cache
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Password hashing
+    password_hash_scheme: str = "scrypt"
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+    scrypt_n: int = 2 ** 14
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+
+    # Trusted responses: set to re-enable full response_model validation
+    validate_trusted_responses: bool = False
+
+    class Config:
+        env_file = ".env"
+
+
+settings = Settings()
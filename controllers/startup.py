@@ -0,0 +1,66 @@
+import importlib
+import time
+from types import ModuleType
+from typing import List
+
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel
+
+from controllers.logs import logger
+from controllers.metrics import registry
+
+startup_seconds = registry.gauge("app_startup_seconds", "Time spent building each router module at startup")
+
+
+class ModuleTiming:
+    def __init__(self, module: str, import_s: float, mount_s: float, routes: int, models: int):
+        self.module = module
+        self.import_s = import_s
+        self.mount_s = mount_s
+        self.routes = routes
+        self.models = models
+
+    def as_dict(self):
+        return {
+            "module": self.module,
+            "import_ms": round(self.import_s * 1000, 3),
+            "mount_ms": round(self.mount_s * 1000, 3),
+            "routes": self.routes,
+            "models": self.models,
+        }
+
+
+def _models_defined_in(module: ModuleType):
+    return [
+        value for value in vars(module).values()
+        if isinstance(value, type) and issubclass(value, BaseModel) and value.__module__ == module.__name__
+    ]
+
+
+# Imports router modules on demand and records what each one costs
+class StartupProfile:
+    def __init__(self, app_name: str):
+        self.app_name = app_name
+        self.modules: List[ModuleTiming] = []
+
+    def mount(self, app: FastAPI, module_name: str) -> ModuleType:
+        start = time.perf_counter()
+        # Importing the module builds its pydantic models and routes
+        module = importlib.import_module(module_name)
+        imported = time.perf_counter()
+        router: APIRouter = module.router
+        app.include_router(router)
+        mounted = time.perf_counter()
+
+        timing = ModuleTiming(
+            module_name, imported - start, mounted - imported, len(router.routes), len(_models_defined_in(module))
+        )
+        self.modules.append(timing)
+        labels = (("app", self.app_name), ("module", module_name))
+        startup_seconds.set(labels + (("phase", "import"),), timing.import_s)
+        startup_seconds.set(labels + (("phase", "mount"),), timing.mount_s)
+        return module
+
+    def report(self):
+        for timing in self.modules:
+            logger.info("startup", app=self.app_name, **timing.as_dict())
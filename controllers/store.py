@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import inspect
+import os
+from bisect import bisect_right, insort
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+# Distinguishes versions issued by this process from those of a previous run
+# or of another worker (each keeps its own versions, so a forked worker draws
+# its own epoch instead of inheriting the master's)
+_EPOCH = os.urandom(4).hex()
+
+
+def _new_epoch():
+    global _EPOCH
+    _EPOCH = os.urandom(4).hex()
+
+
+os.register_at_fork(after_in_child=_new_epoch)
+
+
+# Ordered, indexed item store; keys are all of one (orderable) type
+class OrderedItemStore:
+    def __init__(self, key_type: type = int):
+        self.key_type = key_type
+        self._rows: Dict[Any, dict] = {}
+        self._keys: List[Any] = []
+
+    @classmethod
+    def from_list(cls, rows: Iterable[dict]):
+        store = cls()
+        for key, row in enumerate(rows):
+            store.put(key, row)
+        return store
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def get(self, key, default=None):
+        return self._rows.get(key, default)
+
+    def put(self, key, row: dict):
+        if key not in self._rows:
+            insort(self._keys, key)
+        self._rows[key] = row
+
+    def delete(self, key):
+        if self._rows.pop(key, None) is not None:
+            del self._keys[bisect_right(self._keys, key) - 1]
+
+    def seek(self, after: Union[Any, None], limit: int) -> List[Tuple[Any, dict]]:
+        start = 0 if after is None else bisect_right(self._keys, after)
+        return [(key, self._rows[key]) for key in self._keys[start: start + limit]]
+
+
+# Key/value store whose entries carry a version, bumped on every write.
+# Rows are copy-on-write: a published row is never mutated, writers install a
+# new (version, row) pair, so readers never wait on writers. Writers of the
+# same key serialize on one of a fixed set of striped locks.
+class VersionedStore(MutableMapping):
+    def __init__(self, name: str, rows: Union[Dict[Any, Any], None] = None, stripes: int = 64):
+        self.name = name
+        self._entries: Dict[Any, Tuple[int, Any]] = {}
+        self._tombstones: Dict[Any, int] = {}
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+        self._listeners: List[Callable[[Any, Any], None]] = []
+        for key, row in (rows or {}).items():
+            self[key] = row
+
+    def __getitem__(self, key):
+        return self._entries[key][1]
+
+    def __setitem__(self, key, row):
+        self._entries[key] = (self.version(key) + 1, row)
+        self._notify(key, row)
+
+    def __delitem__(self, key):
+        version, _ = self._entries.pop(key)
+        self._tombstones[key] = version + 1
+        self._notify(key, None)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, {dict(self.items())!r})"
+
+    def version(self, key) -> int:
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else self._tombstones.get(key, 0)
+
+    def etag(self, key) -> str:
+        return f'"{_EPOCH}-{self.name}-{key}-{self.version(key)}"'
+
+    def get_versioned(self, key) -> Tuple[int, Any]:
+        return self._entries[key]
+
+    def get_many(self, keys: Iterable[Any]) -> Tuple[Dict[Any, Tuple[int, Any]], List[Any]]:
+        # One pass over the keys: (found key -> (version, row), missing keys)
+        entries = self._entries
+        found, missing = {}, []
+        for key in keys:
+            entry = entries.get(key)
+            if entry is None:
+                missing.append(key)
+            else:
+                found[key] = entry
+        return found, missing
+
+    def etag_many(self, found: Dict[Any, Tuple[int, Any]], missing: Iterable[Any]) -> str:
+        # Changes whenever any requested key is written, created or deleted
+        digest = hashlib.sha256()
+        for key, (version, _) in found.items():
+            digest.update(f"{key}\0{version}\0".encode())
+        for key in missing:
+            digest.update(f"{key}\0-{self.version(key)}\0".encode())
+        return f'"{_EPOCH}-{self.name}-batch-{digest.hexdigest()[:32]}"'
+
+    def snapshot(self) -> Dict[Any, Any]:
+        # Point-in-time view; rows are shared since they are never mutated
+        return {key: row for key, (_, row) in self._entries.copy().items()}
+
+    def lock_for(self, key) -> asyncio.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+    def compare_and_swap(self, key, expected_version: int, row) -> bool:
+        if self.version(key) != expected_version:
+            return False
+        self._entries[key] = (expected_version + 1, row)
+        self._notify(key, row)
+        return True
+
+    async def update(self, key, func: Callable[[Any], Any]) -> Tuple[int, Any]:
+        # Read-modify-write of one key; func gets the current row and returns a new one
+        async with self.lock_for(key):
+            version, row = self._entries[key]
+            new_row = func(row)
+            if inspect.isawaitable(new_row):
+                new_row = await new_row
+            self._entries[key] = entry = (version + 1, new_row)
+            self._notify(key, new_row)
+            return entry
+
+    def subscribe(self, listener: Callable[[Any, Any], None]):
+        # Called synchronously after every write with (key, row), row is None on delete
+        self._listeners.append(listener)
+
+    def _notify(self, key, row):
+        for listener in self._listeners:
+            listener(key, row)
+
+
+# Items shared by the updates router (/items61-63) and the path_query search
+# (/items11), so either can be mounted without importing the other
+items5 = VersionedStore("items5", {
+    "foo": {"name": "Foo", "price": 50.2},
+    "bar": {"name": "Bar", "description": "The bartenders", "price": 62, "tax": 20.2},
+    "baz": {"name": "Baz", "description": None, "price": 50.2, "tax": 10.5, "tags": []},
+})
@@ -0,0 +1,108 @@
+import inspect
+from typing import Any, AsyncIterator, Callable, Iterable, Union
+
+from fastapi import Request
+from starlette.responses import Response, StreamingResponse
+
+from controllers.serialization import JSONBackendResponse
+from controllers.settings import settings
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(accept: str) -> bool:
+    return NDJSON_MEDIA_TYPE in accept or "application/jsonlines" in accept
+
+
+def vary_on_accept(response: Response) -> Response:
+    # Every response of a negotiating route says so, whichever format it picked,
+    # or a cache could hand a JSON array to an NDJSON client (and vice versa)
+    vary = response.headers.get("vary", "")
+    if "accept" not in (token.strip().lower() for token in vary.split(",")):
+        response.headers.add_vary_header("Accept")
+    return response
+
+
+async def _aiter(items: Union[Iterable, AsyncIterator]):
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def is_streamable(content: Any) -> bool:
+    # Lists are only streamed when large; generators and async iterators always
+    if isinstance(content, (list, tuple)):
+        return len(content) >= settings.stream_min_items
+    return inspect.isgenerator(content) or hasattr(content, "__aiter__")
+
+
+# Chunked JSON array (or NDJSON) body produced from an iterator: items are
+# projected and encoded one at a time and flushed every `chunk_bytes`, so the
+# first byte goes out before the last item exists and memory holds one chunk.
+# Each chunk waits on the ASGI send, which only returns once the server has
+# room in its transport buffer, so a slow client slows the producer down.
+class StreamingJSONResponse(StreamingResponse):
+    def __init__(
+        self,
+        items: Union[Iterable, AsyncIterator],
+        project: Union[Callable[[Any], Any], None] = None,
+        ndjson: bool = False,
+        encode: Callable[[Any], bytes] = JSONBackendResponse.encode,
+        chunk_bytes: int = settings.stream_chunk_bytes,
+        status_code: int = 200,
+        headers: dict = None,
+    ):
+        self.project = project
+        self.ndjson = ndjson
+        self.encode = encode
+        self.chunk_bytes = chunk_bytes
+        super().__init__(
+            self._chunks(items),
+            status_code=status_code,
+            headers=headers,
+            media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json",
+        )
+
+    async def _chunks(self, items):
+        project, encode, chunk_bytes = self.project, self.encode, self.chunk_bytes
+        separator = b"\n" if self.ndjson else b","
+        buffer = [] if self.ndjson else [b"["]
+        size = 0
+        first = True
+        async for item in _aiter(items):
+            if project is not None:
+                item = project(item)
+            data = encode(item)
+            if self.ndjson:
+                buffer.append(data)
+                buffer.append(separator)
+            else:
+                if not first:
+                    buffer.append(separator)
+                buffer.append(data)
+            first = False
+            size += len(data) + 1
+            if size >= chunk_bytes:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        if not self.ndjson:
+            buffer.append(b"]")
+        if buffer:
+            yield b"".join(buffer)
+
+
+def item_encoder(response_class) -> Callable[[Any], bytes]:
+    # Encodes one item the way response_class renders a whole body
+    return getattr(response_class, "encode", None) or (lambda item: response_class(item).body)
+
+
+def stream_items(request: Request, items: Union[Iterable, AsyncIterator], project: Callable[[Any], Any] = None):
+    # For list endpoints without a response_model: NDJSON when the client asks for it.
+    # Items are encoded with the app's own default_response_class
+    response_class = request.app.router.default_response_class
+    encode = item_encoder(getattr(response_class, "value", response_class))
+    ndjson = wants_ndjson(request.headers.get("accept", ""))
+    return vary_on_accept(StreamingJSONResponse(items, project, ndjson=ndjson, encode=encode))
@@ -0,0 +1,151 @@
+import asyncio
+import inspect
+from typing import Any, Callable
+
+from fastapi import Depends
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.utils import get_param_sub_dependant
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from pydantic import ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.fields import ModelField
+from starlette.routing import request_response
+
+from controllers.fields import SparseFields
+from controllers.projection import compile_response_projector
+from controllers.settings import settings
+from controllers.streaming import StreamingJSONResponse, is_streamable, item_encoder, vary_on_accept, wants_ndjson
+
+_RESPONSE_PARAM = "_trusted_response"
+_FIELDS_PARAM = "_trusted_fields"
+_REQUEST_PARAM = "_trusted_request"
+
+
+def _as_set(value):
+    return frozenset(value) if isinstance(value, (set, frozenset, list, tuple)) else None
+
+
+def _response_check(field: ModelField) -> Callable[[Any], Any]:
+    # Full response_model validation of one item, as FastAPI's serialize_response does
+    def check(value):
+        value, errors = field.validate(value, {}, loc=("response",))
+        if errors:
+            raise ValidationError([errors] if isinstance(errors, ErrorWrapper) else errors, field.type_)
+        return value
+    return check
+
+
+def _checked(project: Callable[[Any], Any], check: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda item: project(check(item))
+
+
+# Route class that trusts handler output to already match response_model:
+# the output is only filtered through a precompiled projector, not re-validated.
+#
+#   router = APIRouter(route_class=TrustedRoute)           # per router
+#   app.add_api_route(..., route_class_override=TrustedRoute)  # per route
+#
+# Set VALIDATE_TRUSTED_RESPONSES=1 to also validate every item against
+# response_model before it is projected (e.g. in tests); ?fields=, streaming
+# and Accept negotiation behave the same either way.
+class TrustedRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, endpoint, **kwargs)
+        if self.response_model is None:
+            return
+        # Dict-style (nested) include/exclude are left to FastAPI
+        if any(isinstance(value, dict) for value in (self.response_model_include, self.response_model_exclude)):
+            return
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        options = dict(
+            include=_as_set(self.response_model_include),
+            exclude=_as_set(self.response_model_exclude),
+            by_alias=self.response_model_by_alias,
+            exclude_unset=self.response_model_exclude_unset,
+            exclude_defaults=self.response_model_exclude_defaults,
+            exclude_none=self.response_model_exclude_none,
+            # Backends that render datetime/UUID/Decimal themselves need no encoder pass
+            encode=not getattr(response_class, "handles_native_types", False),
+        )
+        projector = compile_response_projector(self.response_model, **options)
+        if projector is None:
+            return
+        self.projector = projector
+        # ?fields=a,b picks a narrower projector per request
+        many = hasattr(projector, "__self__")
+        # Applied to each item (each row of a list) ahead of the projector
+        self.check = None
+        if settings.validate_trusted_responses:
+            field = self.secure_cloned_response_field
+            self.check = _response_check(field.sub_fields[0] if many else field)
+        self.sparse_fields = SparseFields(projector.__self__ if many else projector, options, many=many)
+        self.dependant.dependencies.append(
+            get_param_sub_dependant(
+                param=inspect.Parameter(
+                    _FIELDS_PARAM, inspect.Parameter.KEYWORD_ONLY, default=Depends(self.sparse_fields)
+                ),
+                path=self.path_format,
+            )
+        )
+        self._wrap_endpoint(response_class, many)
+        # The handler captured whether the endpoint is a coroutine, rebuild it
+        self.app = request_response(self.get_route_handler())
+
+    def _wrap_endpoint(self, response_class, many: bool):
+        dependant = self.dependant
+        call = dependant.call
+        keep_response = dependant.response_param_name is not None
+        if not keep_response:
+            dependant.response_param_name = _RESPONSE_PARAM
+        response_param = dependant.response_param_name
+        keep_request = dependant.request_param_name is not None
+        if many and not keep_request:
+            dependant.request_param_name = _REQUEST_PARAM
+        request_param = dependant.request_param_name
+        default_status = self.status_code
+        encode = item_encoder(response_class)
+        check = self.check
+
+        def build(content, sub_response, projector, request):
+            if isinstance(content, Response):
+                return vary_on_accept(content) if many else content
+            status_code = sub_response.status_code or default_status or 200
+            project = projector.__self__ if many else projector
+            if check is not None:
+                project = _checked(project, check)
+            ndjson = many and wants_ndjson(request.headers.get("accept", ""))
+            if ndjson or (many and is_streamable(content)):
+                # Large lists, iterators and NDJSON go out item by item
+                response = StreamingJSONResponse(
+                    content, project, ndjson=ndjson, encode=encode, status_code=status_code
+                )
+            else:
+                content = [project(item) for item in content] if many else project(content)
+                response = response_class(content, status_code=status_code)
+            response.headers.raw.extend(sub_response.headers.raw)
+            # List routes negotiate JSON vs NDJSON on Accept, even when this one is plain JSON
+            return vary_on_accept(response) if many else response
+
+        def split(values):
+            projector = values.pop(_FIELDS_PARAM)
+            request = None
+            if many:
+                request = values[request_param] if keep_request else values.pop(request_param)
+            if keep_response:
+                return values, values[response_param], projector, request
+            sub_response = values.pop(response_param)
+            return values, sub_response, projector, request
+
+        if asyncio.iscoroutinefunction(call):
+            async def trusted_call(**values):
+                values, sub_response, projector, request = split(values)
+                return build(await call(**values), sub_response, projector, request)
+        else:
+            def trusted_call(**values):
+                values, sub_response, projector, request = split(values)
+                return build(call(**values), sub_response, projector, request)
+
+        dependant.call = trusted_call
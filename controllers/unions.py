@@ -0,0 +1,52 @@
+from typing import Annotated, Any, Dict, Type, Union
+
+from pydantic import BaseModel, Field
+
+from controllers.projection import literal_value
+
+
+# Registry of the subclasses of a base model that share a Literal tag field:
+#
+#   item_types = TaggedUnion(BaseItem, tag="type")
+#
+#   @item_types.register
+#   class CarItem(BaseItem):
+#       type: Literal["car"] = "car"
+#
+#   AnyItem = item_types.annotation()   # response_model
+#
+# The trusted projector dispatches responses on the tag in one lookup instead
+# of trying every member, and response_openapi() adds the discriminator
+# FastAPI leaves out of response schemas.
+class TaggedUnion:
+    def __init__(self, base: Type[BaseModel], tag: str = "type"):
+        self.base = base
+        self.tag = tag
+        self.types: Dict[Any, Type[BaseModel]] = {}
+
+    def register(self, model: Type[BaseModel]) -> Type[BaseModel]:
+        if not issubclass(model, self.base):
+            raise TypeError(f"{model.__name__} is not a {self.base.__name__}")
+        value = literal_value(model, self.tag)
+        if value in self.types:
+            raise ValueError(f"{self.tag}={value!r} is already registered to {self.types[value].__name__}")
+        self.types[value] = model
+        return model
+
+    def annotation(self):
+        members = tuple(self.types.values())
+        if len(members) < 2:
+            raise ValueError("A tagged union needs at least two registered types")
+        return Annotated[Union[members], Field(discriminator=self.tag)]
+
+    def openapi(self) -> dict:
+        return {
+            "discriminator": {
+                "propertyName": self.tag,
+                "mapping": {str(value): f"#/components/schemas/{model.__name__}" for value, model in self.types.items()},
+            }
+        }
+
+    def response_openapi(self, status_code: int = 200) -> dict:
+        # For route(responses=...): merged into the generated response schema
+        return {status_code: {"content": {"application/json": {"schema": self.openapi()}}}}
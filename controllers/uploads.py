@@ -0,0 +1,232 @@
+import hashlib
+from tempfile import SpooledTemporaryFile
+from typing import Dict, List, Union
+
+from fastapi import HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError, StrError
+from starlette.concurrency import run_in_threadpool
+
+from controllers.settings import settings
+
+
+class StreamedFile:
+    def __init__(self, filename: str, content_type: str):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self.max_size = settings.upload_spool_threshold
+        self.spooled_to_disk = False
+        self.file = SpooledTemporaryFile(max_size=self.max_size)
+        # Computed chunk by chunk as the body arrives, never by re-reading the file
+        self._hash = hashlib.sha256()
+
+    async def write(self, data: bytes):
+        self.size += len(data)
+        # The write that crosses max_size rolls the file over to disk (and
+        # every later one goes to disk), so those run off the event loop
+        if self.size > self.max_size:
+            self.spooled_to_disk = True
+            await run_in_threadpool(self._write, data)
+        else:
+            self._write(data)
+
+    def _write(self, data: bytes):
+        self._hash.update(data)
+        self.file.write(data)
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    async def read(self, size: int = -1) -> bytes:
+        if self.spooled_to_disk:
+            return await run_in_threadpool(self.file.read, size)
+        return self.file.read(size)
+
+    def close(self):
+        self.file.close()
+
+
+def _check_file(name: str, value) -> StreamedFile:
+    if not isinstance(value, StreamedFile):
+        error = ValueError(f"Expected UploadFile, received: {type(value)}")
+        raise RequestValidationError([ErrorWrapper(error, loc=("body", name))])
+    return value
+
+
+def _check_text(name: str, value) -> str:
+    if not isinstance(value, str):
+        raise RequestValidationError([ErrorWrapper(StrError(), loc=("body", name))])
+    return value
+
+
+class StreamedForm:
+    def __init__(self):
+        self._items: Dict[str, List[Union[str, StreamedFile]]] = {}
+
+    def append(self, name: str, value: Union[str, StreamedFile]):
+        self._items.setdefault(name, []).append(value)
+
+    def get(self, name: str, default=None):
+        values = self._items.get(name)
+        return values[0] if values else default
+
+    def getlist(self, name: str):
+        return self._items.get(name, [])
+
+    def require(self, name: str):
+        if name not in self._items:
+            raise RequestValidationError([ErrorWrapper(MissingError(), loc=("body", name))])
+        return self._items[name][0]
+
+    def require_list(self, name: str):
+        self.require(name)
+        return self._items[name]
+
+    # Like File(): a plain form field under a file's name is a validation error
+    def get_file(self, name: str) -> Union[StreamedFile, None]:
+        value = self.get(name)
+        return None if value is None else _check_file(name, value)
+
+    def require_file(self, name: str) -> StreamedFile:
+        return _check_file(name, self.require(name))
+
+    def require_files(self, name: str) -> List[StreamedFile]:
+        return [_check_file(name, value) for value in self.require_list(name)]
+
+    # Like Form(): a file sent under a text field's name is a validation error
+    def require_text(self, name: str) -> str:
+        return _check_text(name, self.require(name))
+
+    def close(self):
+        for values in self._items.values():
+            for value in values:
+                if isinstance(value, StreamedFile):
+                    value.close()
+
+
+# Global accounting of upload bytes currently held by in-flight requests
+class InFlightBytes:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.current = 0
+
+    def reserve(self, size: int):
+        if self.current + size > self.limit:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many uploads in progress",
+                headers={"Retry-After": "1"},
+            )
+        self.current += size
+
+    def release(self, size: int):
+        self.current -= size
+
+
+inflight_bytes = InFlightBytes(settings.upload_max_inflight_bytes)
+
+
+async def _parse(request: Request, form: StreamedForm, received: List[int]):
+    content_type, params = parse_options_header(request.headers.get("Content-Type", ""))
+    if content_type != b"multipart/form-data":
+        return
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise HTTPException(status_code=400, detail="Missing boundary in multipart.")
+
+    events = []
+    parser = MultipartParser(boundary, {
+        "on_part_begin": lambda: events.append(("begin", b"")),
+        "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+        "on_part_end": lambda: events.append(("end", b"")),
+        "on_header_field": lambda data, start, end: events.append(("field", data[start:end])),
+        "on_header_value": lambda data, start, end: events.append(("value", data[start:end])),
+        "on_header_end": lambda: events.append(("header_end", b"")),
+        "on_headers_finished": lambda: events.append(("headers_finished", b"")),
+    })
+    header_field = header_value = b""
+    headers = {}
+    name = ""
+    current: Union[StreamedFile, None] = None
+    data = b""
+
+    async for chunk in request.stream():
+        if not chunk:
+            continue
+        if received[0] + len(chunk) > settings.upload_max_request_bytes:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Upload too large")
+        inflight_bytes.reserve(len(chunk))
+        received[0] += len(chunk)
+        try:
+            parser.write(chunk)
+        except MultipartParseError:
+            raise HTTPException(status_code=400, detail="Invalid multipart body")
+        for event, payload in events:
+            if event == "begin":
+                headers, data = {}, b""
+            elif event == "field":
+                header_field += payload
+            elif event == "value":
+                header_value += payload
+            elif event == "header_end":
+                headers[header_field.lower()] = header_value
+                header_field = header_value = b""
+            elif event == "headers_finished":
+                _, options = parse_options_header(headers.get(b"content-disposition", b""))
+                name = options.get(b"name", b"").decode()
+                if b"filename" in options:
+                    current = StreamedFile(
+                        filename=options[b"filename"].decode(),
+                        content_type=headers.get(b"content-type", b"").decode("latin-1"),
+                    )
+                    form.append(name, current)
+                else:
+                    current = None
+            elif event == "data":
+                if current is not None:
+                    await current.write(payload)
+                else:
+                    data += payload
+            elif event == "end":
+                if current is not None:
+                    current.file.seek(0)
+                else:
+                    form.append(name, data.decode())
+        events.clear()
+    try:
+        parser.finalize()
+    except MultipartParseError:
+        raise HTTPException(status_code=400, detail="Invalid multipart body")
+
+
+# Streaming upload dependency: reads the body in chunks instead of buffering it
+async def streamed_form(request: Request):
+    form = StreamedForm()
+    received = [0]
+    try:
+        await _parse(request, form, received)
+        yield form
+    finally:
+        form.close()
+        inflight_bytes.release(received[0])
+
+
+def multipart_openapi(properties: Dict[str, dict], required: List[str]):
+    return {
+        "requestBody": {
+            "content": {
+                "multipart/form-data": {
+                    "schema": {"type": "object", "properties": properties, "required": required}
+                }
+            },
+            "required": bool(required),
+        }
+    }
+
+
+binary = {"type": "string", "format": "binary"}